@@ -62,5 +62,7 @@ class Day01(Puzzle):
         return zero
 
 
-puzzle = Day01()
-puzzle.run(3, 6)
+puzzle = Day01().register(3, 6)
+
+if __name__ == '__main__':
+    puzzle.run()
@@ -59,5 +59,7 @@ class Day02(Puzzle):
         return self.mp_sum_matches(r'([1-9][0-9]*)(\1)+', data)
 
 
-puzzle = Day02()
-puzzle.run(1227775554, 4174379265)
+puzzle = Day02().register(1227775554, 4174379265)
+
+if __name__ == '__main__':
+    puzzle.run()
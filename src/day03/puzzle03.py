@@ -26,5 +26,7 @@ class Day03(Puzzle):
         return int(result)
 
 
-puzzle = Day03()
-puzzle.run(357, 3121910778619)
+puzzle = Day03().register(357, 3121910778619)
+
+if __name__ == '__main__':
+    puzzle.run()
@@ -5,53 +5,63 @@ from typing import Any
 from common import *
 
 
-NEIGHBORS: list[GridDirection] = [NORTH, SOUTH, WEST, EAST, NW, NE, SW, SE]
+ROLLS: dict[str, Any] = {'.': None, '@': 1}
 
 
 class Rolls(Grid):
 
-    def __init__(self, lines):
+    def __init__(self, lines, **keywords):
         # Use a sparse grid, using 1 for rolls, and 0 for empty spaces
-        super().__init__(lines, sparse=True, conversion=self.conversion, default=0)
-
-    def is_accessible(self, position) -> bool:
-        return self[position] and (sum([self[position+offset] for offset in NEIGHBORS]) < 4)
+        super().__init__(lines, sparse=True, table=ROLLS, default=0, **keywords)
 
     @property
     def accessible(self) -> list[GridPosition]:
-        return list(filter(self.is_accessible, self.keys()))
+        neighbors: Grid = self.neighbor_counts(ADJACENT)
+        return [position for position in self.keys() if neighbors[position] < 4]
+
+    def peel(self) -> list[int]:
+        """Remove accessible rolls round by round until none are left, returning the number removed in each round"""
+
+        # Removing a roll only changes its neighbors' counts, so only neighbors that drop below 4 join the next round
+        neighbors: Grid = self.neighbor_counts(ADJACENT)
+        counts: dict[GridPosition, int] = {position: neighbors[position] for position in self.keys()}
+        candidates: list[GridPosition] = [position for position, count in counts.items() if count < 4]
 
-    def remove_accessible(self) -> int:
-        positions: list[GridPosition] = self.accessible
-        for pos in positions:
-            del self[pos]
-        return len(positions)
+        rounds: list[int] = []
+        while candidates:
+            rounds.append(len(candidates))
+            for position in candidates:
+                del self[position]
+                del counts[position]
 
-    @staticmethod
-    def conversion(ch: str) -> Any:
-        return None if ch == '.' else 1
+            following: list[GridPosition] = []
+            for position in candidates:
+                for offset in ADJACENT:
+                    neighbor: GridPosition = position + offset
+                    if neighbor in counts:
+                        counts[neighbor] -= 1
+                        if counts[neighbor] == 3:
+                            following.append(neighbor)
+            candidates = following
+
+        return rounds
 
 
 class Day04(Puzzle):
     """Solution for day 04 (Printing Department)"""
 
     def parse_data(self, filename: str) -> Data:
-        return Rolls(self.read_stripped(filename))
+        return Rolls(self.read_bytes(filename))
 
     def part1(self, data: Rolls) -> PuzzleResult:
         result: int = len(data.accessible)
         return result
 
     def part2(self, data: Rolls) -> PuzzleResult:
-        total = 0
-
-        removed: int = data.remove_accessible()
-        while removed:
-            total += removed
-            removed = data.remove_accessible()
+        return sum(data.peel())
 
-        return total
 
+puzzle = Day04().register(13, 43)
 
-puzzle = Day04()
-puzzle.run(13, 43)
+if __name__ == '__main__':
+    puzzle.run()
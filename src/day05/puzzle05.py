@@ -67,5 +67,7 @@ class Day05(Puzzle):
         return sum([len(r) for r in data.ranges])
 
 
-puzzle = Day05()
-puzzle.run(3, 14)
+puzzle = Day05().register(3, 14)
+
+if __name__ == '__main__':
+    puzzle.run()
@@ -66,5 +66,7 @@ class Day06(Puzzle):
         return data.total(data.ops2, data.data2)
 
 
-puzzle = Day06()
-puzzle.run(4277556, 3263827)
+puzzle = Day06().register(4277556, 3263827)
+
+if __name__ == '__main__':
+    puzzle.run()
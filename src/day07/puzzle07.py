@@ -1,11 +1,8 @@
 from __future__ import annotations
 
-from collections import deque
-
 from common import *
 
 SPLITTER = '^'
-PATH = '|'
 
 
 class Tachyon:
@@ -13,40 +10,21 @@ class Tachyon:
     def __init__(self, lines):
         self.manifold = Grid(lines, sparse=True, conversion=Grid.conv_blank('.'))
         self.start = self.manifold.find('S')[0]
+        self.splitters: BitGrid = BitGrid.from_grid(self.manifold, lambda value: value == SPLITTER)
 
     def tachyon_manifold(self) -> int:
-        splits = 0
-        queue: deque[GridPosition] = deque([self.start])
-        while len(queue):
-            next: GridPosition = queue.popleft() + DOWN
-            if next in self.manifold and self.manifold[next] == SPLITTER:
-                split = False
-
-                left: GridPosition = next+LEFT
-                if left not in self.manifold:
-                    self.manifold[left] = PATH
-                    queue.append(left)
-                    split = True
-
-                right: GridPosition = next+RIGHT
-                if right not in self.manifold:
-                    self.manifold[right] = PATH
-                    queue.append(right)
-                    split = True
-
-                if split:
-                    splits += 1
-
-            elif GridRow(next) <= self.manifold.rows:
-                if next not in self.manifold:
-                    self.manifold[next] = PATH
-                    queue.append(next)
-
+        # Move the whole row of beams down at once; beams that hit splitters continue to either side of them
+        splits: int = 0
+        beams: int = 1 << GridCol(self.start)
+        for row in range(GridRow(self.start) + 1, self.splitters.rows):
+            hits: int = beams & self.splitters.bits[row]
+            splits += hits.bit_count()
+            beams = (beams & ~hits) | ((hits << 1) & self.splitters.mask) | (hits >> 1)
         return splits
 
     @cache
     def count_paths(self, position) -> int:
-        while position in self.manifold and self.manifold[position] != SPLITTER:
+        while GridRow(position) < self.manifold.rows and self.manifold[position] != SPLITTER:
             position += DOWN
 
         if self.manifold[position] == SPLITTER:
@@ -71,5 +49,7 @@ class Day07(Puzzle):
         return data.quantum_tachyon_manifold()
 
 
-puzzle = Day07()
-puzzle.run(21, 40)
+puzzle = Day07().register(21, 40)
+
+if __name__ == '__main__':
+    puzzle.run()
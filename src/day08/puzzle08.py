@@ -1,7 +1,10 @@
 from __future__ import annotations
 
+from array import array
+from itertools import islice
 from math import sqrt
-from operator import attrgetter
+from typing import Iterator
+
 from common import *
 
 
@@ -50,15 +53,31 @@ class Playground:
 
     def __init__(self, lines):
         self.boxes: list[Box] = [Box.factory(line) for line in lines]
-        self.pairs: list[Pair] = []
+
+        # Order the pairs by (squared) distance, storing each pair compactly as a single index,
+        # so that the parsed data is cheap to cache and pairs are only created as they're used
+        size: int = len(self.boxes)
+        codes: list[int] = []
         for this, a in enumerate(self.boxes):
-            self.pairs.extend([Pair(a, b) for b in self.boxes[this+1:]])
+            for that in range(this+1, size):
+                b: Box = self.boxes[that]
+                squared: int = (a.x-b.x)**2 + (a.y-b.y)**2 + (a.z-b.z)**2
+                codes.append((squared * size + this) * size + that)
+        codes.sort()
 
-        self.pairs.sort(key=attrgetter('distance'))
+        self.order: array = array('L', [code % (size*size) for code in codes])
 
     def __len__(self) -> int:
         return len(self.boxes)
 
+    @property
+    def pairs(self) -> Iterator[Pair]:
+        """Every pair of boxes, from nearest to farthest"""
+        size: int = len(self.boxes)
+        for index in self.order:
+            this, that = divmod(index, size)
+            yield Pair(self.boxes[this], self.boxes[that])
+
     def connect(self) -> int:
         limit: int = 1000 if hasattr(self, 'datatype') and getattr(self, 'datatype') == 'real' else 10
 
@@ -67,7 +86,7 @@ class Playground:
             lookup[box] = set([box])
         circuits: list[Circuit] = list(lookup.values())
 
-        for pair in self.pairs[:limit]:
+        for pair in islice(self.pairs, limit):
             circuit_a = lookup[pair.a]
             circuit_b = lookup[pair.b]
 
@@ -134,5 +153,7 @@ class Day08(Puzzle):
         return data.distance()
 
 
-puzzle = Day08()
-puzzle.run(40, 25272)
+puzzle = Day08().register(40, 25272)
+
+if __name__ == '__main__':
+    puzzle.run()
@@ -1,18 +1,21 @@
 from __future__ import annotations
 
+from typing import Any
+
 from common import *
 
 
 RED = '#'
 GREEN = 'X'
+OUTSIDE = '.'
 
 
 class MovieTheater:
 
     def __init__(self, lines):
-        self.grid: Grid = Grid(sparse=True, dynamic=True, default='.')
-        for col, row in [line.split(',') for line in lines]:
-            self.grid[int(row), int(col)] = RED
+        points: list[tuple[int, int]] = [(int(row), int(col)) for col, row in [line.split(',') for line in lines]]
+        self.tiles: list[GridPosition] = [GridPosition(*point) for point in points]
+        self.grid: Grid = Grid.from_points(points, RED, sparse=True, dynamic=True, default='.')
 
     def __len__(self) -> int:
         return len(self.grid)
@@ -28,6 +31,27 @@ class MovieTheater:
 
         return largest
 
+    def largest_inside(self) -> int:
+        # Outline the loop of red and green tiles on a compressed floor, and mark everything outside of it
+        floor: CompressedGrid = CompressedGrid(self.tiles, margin=1)
+        for src, tgt in zip(self.tiles, self.tiles[1:] + self.tiles[:1]):
+            floor.line(src, tgt, GREEN)
+        for tile in self.tiles:
+            floor.put(tile, RED)
+        floor.fill(floor.expand(0j), OUTSIDE)
+
+        def outside(value: Any) -> bool:
+            return value == OUTSIDE
+
+        largest: int = 0
+        for index, left in enumerate(self.tiles[:-1]):
+            for right in self.tiles[index+1:]:
+                area: int = GridArea(left, right)
+                if area > largest and not floor.area(left, right, outside):
+                    largest = area
+
+        return largest
+
 
 class Day09(Puzzle):
     """Solution for day 09 (Movie Theater)"""
@@ -41,8 +65,10 @@ class Day09(Puzzle):
         return data.largest_square()
 
     def part2(self, data: MovieTheater) -> PuzzleResult:
-        return 0
+        return data.largest_inside()
+
 
+puzzle = Day09().register(50, 24)
 
-puzzle = Day09()
-puzzle.run(50, 24)
+if __name__ == '__main__':
+    puzzle.run()
@@ -1,7 +1,6 @@
 from __future__ import annotations
 
-from collections import deque
-from multiprocessing import Pool
+from typing import Optional
 
 from common import *
 
@@ -9,7 +8,7 @@ BINARY = str.maketrans('.#', '01')
 
 
 @dataclass
-class Machine:
+class Machine(BreadthFirstSearch):
     lights: str
     buttons: list[list[int]]
     joltage: list[int]
@@ -17,28 +16,27 @@ class Machine:
     ops: list[int]
     jolts: list[list[int]]
 
+    # Pressing a button twice undoes it, so the light states form an undirected graph
+    bidirectional = True
+
     @property
     def size(self) -> int:
         return len(self.ops)
 
+    def neighbors(self, state: int) -> list[int]:
+        return [state ^ op for op in self.ops]
+
     def light_presses(self) -> int:
-        queue: deque[tuple[int, int]] = deque([(0, 1)])
-        while True:
-            state, depth = queue.popleft()
-            states = [state ^ op for op in self.ops]
-            if self.goal in states:
-                return depth
-            queue.extend([(s, depth+1) for s in states])
+        path: Optional[list[int]] = self.search(0, self.goal)
+        if path is None:
+            raise ValueError(f'No button presses set the lights to {self.lights}')
+        return len(path) - 1
 
     def power_presses(self) -> int:
-        start = [0]*len(self.joltage)
-        queue: deque[tuple[list[int], int]] = deque([(start, 1)])
-        while True:
-            current, depth = queue.popleft()
-            joltages = [[c+j for c, j in zip(current, self.jolts[b])] for b in range(self.size)]
-            if self.joltage in joltages:
-                return depth
-            queue.extend([(j, depth+1) for j in joltages])
+        path: Optional[list[list[int]]] = Joltages(self.jolts, self.joltage).search([0]*len(self.joltage), self.joltage)
+        if path is None:
+            raise ValueError(f'No button presses set the joltages to {self.joltage}')
+        return len(path) - 1
 
     @classmethod
     def factory(cls, line: str) -> Machine:
@@ -66,6 +64,20 @@ class Machine:
         return cls(lights, buttons, joltage, goal, ops, jolts)
 
 
+@dataclass
+class Joltages(BreadthFirstSearch):
+    jolts: list[list[int]]
+    joltage: list[int]
+
+    def encode(self, state: list[int]) -> tuple[int, ...]:
+        return tuple(state)
+
+    def neighbors(self, state: list[int]) -> list[list[int]]:
+        # Joltages only ever go up, so any state with a counter past its target is a dead end
+        states: list[list[int]] = [[c+j for c, j in zip(state, jolt)] for jolt in self.jolts]
+        return [s for s in states if all(c <= g for c, g in zip(s, self.joltage))]
+
+
 class Day10(Puzzle):
     """Solution for day 10 (Factory)"""
 
@@ -78,9 +90,7 @@ class Day10(Puzzle):
         return results
 
     def part1(self, data: Data) -> PuzzleResult:
-        with Pool() as pool:
-            presses = pool.map(self.indicate, data)
-        return sum(presses)
+        return sum(map(self.indicate, data))
 
     @staticmethod
     def joltage(machine: Machine) -> int:
@@ -88,11 +98,11 @@ class Day10(Puzzle):
         return results
 
     def part2(self, data: Data) -> PuzzleResult:
-        # with Pool(1) as pool:
-        #     presses = pool.map(self.joltage, data)
-        # return sum(presses)
+        # return sum(map(self.joltage, data))
         return 0
 
 
-puzzle = Day10()
-puzzle.run(7, 33)
+puzzle = Day10().register(7, 33)
+
+if __name__ == '__main__':
+    puzzle.run()
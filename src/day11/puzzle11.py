@@ -91,5 +91,7 @@ class Day11(Puzzle):
         # return p1 * p2 * p3
 
 
-puzzle = Day11('real.data', 'test1.data', 'test2.data')
-puzzle.run([5, None], [None, 2])
+puzzle = Day11('real.data', 'test1.data', 'test2.data').register([5, None], [None, 2])
+
+if __name__ == '__main__':
+    puzzle.run()
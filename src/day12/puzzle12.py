@@ -54,5 +54,7 @@ class Day12(Puzzle):
         return 0
 
 
-puzzle = Day12()
-puzzle.run(2)
+puzzle = Day12().register(2)
+
+if __name__ == '__main__':
+    puzzle.run()
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import os
+import string
+import sys
+
+from argparse import ArgumentParser, Namespace
+from math import cos, pi, sin, sqrt
+from random import Random
+from typing import Callable
+
+TOP: str = os.path.dirname(os.path.abspath(__file__))
+
+Generator = Callable[[Random, float], str]
+GENERATORS: dict[str, Generator] = {}
+
+
+def generator(day: str) -> Callable[[Generator], Generator]:
+    """Register a function that creates the input for a day, given a seeded Random and a scale factor"""
+
+    def register(function: Generator) -> Generator:
+        GENERATORS[day] = function
+        return function
+    return register
+
+
+def scaled(size: int, scale: float) -> int:
+    """Scale a record count"""
+    return max(1, round(size * scale))
+
+
+def side(size: int, scale: float) -> int:
+    """Scale one side of a square grid, so that the number of cells grows with the scale"""
+    return max(3, round(size * sqrt(scale)))
+
+
+def lines(rows: list[str]) -> str:
+    return ''.join(f'{row}\n' for row in rows)
+
+
+@generator('day01')
+def rotations(rng: Random, scale: float) -> str:
+    return lines([f'{rng.choice("LR")}{rng.randint(1, 999)}' for _ in range(scaled(4543, scale))])
+
+
+@generator('day02')
+def id_ranges(rng: Random, scale: float) -> str:
+    ranges: list[str] = []
+    for _ in range(scaled(37, scale)):
+        digits: int = rng.randint(1, 10)
+        first: int = rng.randint(10 ** (digits-1), 10 ** digits - 1)
+        ranges.append(f'{first}-{first + rng.randint(0, 150_000)}')
+    return ','.join(ranges) + '\n'
+
+
+@generator('day03')
+def battery_banks(rng: Random, scale: float) -> str:
+    return lines([''.join(rng.choices('123456789', k=100)) for _ in range(scaled(200, scale))])
+
+
+@generator('day04')
+def roll_grid(rng: Random, scale: float) -> str:
+    size: int = side(138, scale)
+    return lines([''.join(rng.choices('@.', weights=(7, 3), k=size)) for _ in range(size)])
+
+
+@generator('day05')
+def ingredient_ranges(rng: Random, scale: float) -> str:
+    ranges: list[str] = []
+    for _ in range(scaled(194, scale)):
+        start: int = rng.randint(1, 560_000_000_000_000)
+        ranges.append(f'{start}-{start + rng.randint(0, 7_000_000_000_000)}')
+    ingredients: list[str] = [str(rng.randint(1, 560_000_000_000_000)) for _ in range(scaled(1000, scale))]
+    return lines(ranges) + '\n' + lines(ingredients)
+
+
+@generator('day06')
+def worksheet(rng: Random, scale: float) -> str:
+    rows: list[list[str]] = [[], [], [], []]
+    for _ in range(scaled(1000, scale)):
+        # Order the numbers by length, so that every column of digits is unbroken when read downwards
+        numbers: list[str] = sorted((str(rng.randint(1, 10 ** rng.randint(1, 4) - 1)) for _ in range(3)), key=len, reverse=rng.random() < 0.5)
+        width: int = max(map(len, numbers))
+        align: Callable[[str, int], str] = str.ljust if rng.random() < 0.5 else str.rjust
+        for row, number in enumerate(numbers):
+            rows[row].append(align(number, width))
+        rows[3].append(rng.choice('+*').ljust(width))
+    return lines([' '.join(row) for row in rows])
+
+
+@generator('day07')
+def manifold(rng: Random, scale: float) -> str:
+    size: int = side(141, scale) | 1
+    center: int = size // 2
+    grid: list[list[str]] = [['.'] * size for _ in range(size)]
+    grid[0][center] = 'S'
+    for level, row in enumerate(range(2, size-1, 2)):
+        for col in range(center - level, center + level + 1, 2):
+            if 0 <= col < size and (level == 0 or rng.random() < 0.85):
+                grid[row][col] = '^'
+    return lines([''.join(row) for row in grid])
+
+
+@generator('day08')
+def boxes(rng: Random, scale: float) -> str:
+    return lines([','.join(str(rng.randint(0, 99_999)) for _ in range(3)) for _ in range(scaled(1000, scale))])
+
+
+@generator('day09')
+def red_tiles(rng: Random, scale: float) -> str:
+    # Walk around a noisy circle, alternating horizontal and vertical moves, to make a closed rectilinear polygon
+    count: int = scaled(248, scale)
+    points: list[tuple[int, int]] = []
+    for step in range(count):
+        angle: float = 2 * pi * step / count
+        radius: float = 48_000 * (1 - 0.05 * rng.random())
+        points.append((round(50_000 + radius * cos(angle)), round(50_000 + radius * sin(angle))))
+
+    tiles: list[str] = []
+    for (x, y), (next_x, _) in zip(points, points[1:] + points[:1]):
+        tiles.append(f'{x},{y}')
+        tiles.append(f'{next_x},{y}')
+    return lines(tiles)
+
+
+@generator('day10')
+def machines(rng: Random, scale: float) -> str:
+    rows: list[str] = []
+    for _ in range(scaled(163, scale)):
+        size: int = rng.randint(4, 10)
+        buttons: list[list[int]] = [sorted(rng.sample(range(size), rng.randint(1, size))) for _ in range(rng.randint(size-1, size+3))]
+
+        lights: list[bool] = [False] * size
+        joltage: list[int] = [0] * size
+        for button in buttons:
+            toggled: bool = rng.random() < 0.5
+            presses: int = rng.randint(0, 40)
+            for light in button:
+                lights[light] ^= toggled
+                joltage[light] += presses
+        if not any(lights):
+            for light in buttons[0]:
+                lights[light] = True
+
+        diagram: str = ''.join('#' if light else '.' for light in lights)
+        wiring: str = ' '.join(f'({",".join(map(str, button))})' for button in buttons)
+        rows.append(f'[{diagram}] {wiring} {{{",".join(map(str, joltage))}}}')
+    return lines(rows)
+
+
+@generator('day11')
+def devices(rng: Random, scale: float) -> str:
+    # A layered, acyclic device graph, where every device is wired to devices one or two layers closer to 'out'
+    depth: int = max(10, round(38 * sqrt(scale)))
+    width: int = max(2, round(16 * sqrt(scale)))
+    special: dict[int, str] = {depth: 'svr', depth * 27 // 38: 'fft', depth * 9 // 38: 'dac', 7: 'you'}
+
+    length: int = 3
+    while 26 ** length < depth * width + len(special) + 1:
+        length += 1
+
+    used: set[str] = {'out', *special.values()}
+    layers: list[list[str]] = [['out']]
+    for level in range(1, depth+1):
+        layer: list[str] = [special[level]] if level in special else []
+        while len(layer) < (1 if level == depth else width):
+            name: str = ''.join(rng.choices(string.ascii_lowercase, k=length))
+            if name not in used:
+                used.add(name)
+                layer.append(name)
+        layers.append(layer)
+
+    rows: list[str] = []
+    for level, layer in enumerate(layers[1:], 1):
+        below: list[str] = layers[level-1] + (layers[level-2] if level > 1 else [])
+        for name in layer:
+            edges: list[str] = [rng.choice(layers[level-1])]
+            edges.extend(rng.sample(below, min(len(below), rng.randint(0, 4))))
+            rows.append(f'{name}: {" ".join(dict.fromkeys(edges))}')
+    rng.shuffle(rows)
+    return lines(rows)
+
+
+@generator('day12')
+def present_regions(rng: Random, scale: float) -> str:
+    shapes: list[str] = []
+    for index in range(6):
+        cells: list[str] = ['#'] * 9
+        for blank in rng.sample(range(9), rng.randint(1, 3)):
+            cells[blank] = '.'
+        shapes.append(f'{index}:\n' + lines([''.join(cells[row*3:row*3+3]) for row in range(3)]))
+
+    regions: list[str] = []
+    for _ in range(scaled(1000, scale)):
+        width, height = rng.randint(35, 50), rng.randint(35, 50)
+        quantities: list[int] = [rng.randint(20, width * height // 35) for _ in range(6)]
+        regions.append(f'{width}x{height}: {" ".join(map(str, quantities))}')
+    return '\n'.join(shapes) + '\n' + lines(regions)
+
+
+def generate(day: str, scale: float, seed: int, filename: str) -> str:
+    """Write a generated input file into a day's directory, returning its path"""
+
+    path: str = os.path.join(TOP, day, filename)
+    with open(path, 'w') as output:
+        output.write(GENERATORS[day](Random(f'{day}:{seed}'), scale))
+    return path
+
+
+def options(arguments: list[str]) -> Namespace:
+    parser = ArgumentParser(description='Generate scaled, reproducible inputs for the puzzles')
+    parser.add_argument('days', nargs='*', help='days to generate (1, 01, day01); defaults to every day')
+    parser.add_argument('--scale', type=float, default=1.0, help='input size, relative to the real data')
+    parser.add_argument('--seed', type=int, default=2025, help='random seed')
+    parser.add_argument('--output', help='file name to write in each day directory (default scale<SCALE>.data)')
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str]) -> None:
+    args: Namespace = options(arguments)
+    filename: str = args.output or f'scale{args.scale:g}.data'
+
+    days: list[str] = [f'day{int("".join(filter(str.isdigit, day))):02d}' for day in args.days] or sorted(GENERATORS)
+    for day in days:
+        print(f'{generate(day, args.scale, args.seed, filename)}')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
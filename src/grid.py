@@ -1,8 +1,27 @@
 from __future__ import annotations
 
-from collections.abc import MutableMapping, KeysView, ItemsView, ValuesView
-from typing import Any, Callable, Iterator, Mapping, Optional, cast, TypeAlias  # noqa: F401
+import json
+import os
+import pickle
+import sys
+
+from array import array
+from base64 import b64decode, b64encode
+from bisect import bisect_right
+from collections import Counter, deque
+from collections.abc import MutableMapping, KeysView, ItemsView, Sequence, ValuesView
+from dataclasses import dataclass, replace
+from functools import cache
+from types import FrameType
+from itertools import chain
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, cast, TypeAlias  # noqa: F401
 from math import sqrt
+from mmap import mmap as memory_map, ACCESS_COPY, ALLOCATIONGRANULARITY
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 GridPosition: TypeAlias = complex
@@ -19,6 +38,9 @@ NE: GridDirection = NORTH + EAST
 SE: GridDirection = SOUTH + EAST
 SW: GridDirection = SOUTH + WEST
 
+ORTHOGONAL: list[GridDirection] = [NORTH, SOUTH, WEST, EAST]
+ADJACENT: list[GridDirection] = ORTHOGONAL + [NW, NE, SE, SW]
+
 
 def GridRow(position: GridPosition) -> int:
     return int(position.real)
@@ -50,6 +72,377 @@ def GridArea(src: GridPosition, tgt: GridPosition) -> int:
     return area
 
 
+MISSING: Any = object()
+
+
+class Deleted:
+    """Marks a cell that a snapshot has deleted; it pickles and copies as the DELETED singleton"""
+
+    def __reduce__(self) -> str:
+        return 'DELETED'
+
+    def __repr__(self) -> str:
+        return 'DELETED'
+
+
+DELETED: Any = Deleted()
+GRID_MAGIC: bytes = b'AOCGRID1'
+CHARS: list[str] = [chr(code) for code in range(256)]
+
+
+class DenseStorage(MutableMapping):
+    """Fixed-size, row-major cell storage for a Grid, addressed by position like the default dict storage"""
+
+    def __init__(self, min_row: int, min_col: int, rows: int, cols: int, buffer: Any, empty: Any) -> None:
+        self.min_row: int = min_row
+        self.min_col: int = min_col
+        self.rows: int = rows
+        self.cols: int = cols
+        self.buffer: Any = buffer
+        self.empty: Any = empty
+        self.count: int = self.occupied()
+
+    def occupied(self) -> int:
+        return sum(1 for cell in self.buffer if cell != self.empty)
+
+    def encode(self, value: Any) -> Any:
+        return value
+
+    def decode(self, cell: Any) -> Any:
+        return cell
+
+    def index(self, key: GridPosition) -> int:
+        row: int = int(key.real) - self.min_row
+        col: int = int(key.imag) - self.min_col
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row * self.cols + col
+        return -1
+
+    def position(self, index: int) -> GridPosition:
+        row, col = divmod(index, self.cols)
+        return GridPosition(row + self.min_row, col + self.min_col)
+
+    def indices(self) -> Iterator[int]:
+        empty: Any = self.empty
+        return (index for index, cell in enumerate(self.buffer) if cell != empty)
+
+    def get(self, key: GridPosition, default: Any = None) -> Any:
+        row: int = int(key.real) - self.min_row
+        col: int = int(key.imag) - self.min_col
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            cell: Any = self.buffer[row * self.cols + col]
+            if cell != self.empty:
+                return self.decode(cell)
+        return default
+
+    def __getitem__(self, key: GridPosition) -> Any:
+        value: Any = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: GridPosition, value: Any) -> None:
+        if value is None:
+            self.pop(key, None)
+            return
+        index: int = self.index(key)
+        if index < 0:
+            raise IndexError(f'{key} is outside of the dense grid')
+        cell: Any = self.encode(value)
+        if cell == self.empty:
+            raise ValueError(f'{value!r} marks empty cells in {self.__class__.__name__}, so it can not be stored')
+        if self.buffer[index] == self.empty:
+            self.count += 1
+        self.buffer[index] = cell
+
+    def __delitem__(self, key: GridPosition) -> None:
+        index: int = self.index(key)
+        if index < 0 or self.buffer[index] == self.empty:
+            raise KeyError(key)
+        self.buffer[index] = self.empty
+        self.count -= 1
+
+    def __contains__(self, key: object) -> bool:
+        index: int = self.index(key) if isinstance(key, GridPosition) else -1
+        return index >= 0 and self.buffer[index] != self.empty
+
+    def __iter__(self) -> Iterator[GridPosition]:
+        return map(self.position, self.indices())
+
+    def __len__(self) -> int:
+        return self.count
+
+    def find(self, value: Any) -> list[GridPosition]:
+        cell: Any = self.encode(value)
+        return [self.position(index) for index, other in enumerate(self.buffer) if other == cell]
+
+    def clear(self) -> None:
+        for index in range(len(self.buffer)):
+            self.buffer[index] = self.empty
+        self.count = 0
+
+    @property
+    def array(self) -> Any:
+        """The cells as a two-dimensional (rows x cols) numpy view of the buffer"""
+        return numpy.frombuffer(self.buffer, dtype=self.typecode).reshape(self.rows, self.cols)
+
+    def mask(self, predicate: Optional[Callable[[Any], bool]] = None) -> Any:
+        """A numpy array that is True for every stored cell whose value matches the predicate"""
+
+        cells: Any = self.array
+        if predicate is None:
+            return cells != self.empty
+        return numpy.isin(cells, [code for code in numpy.unique(cells) if code != self.empty and predicate(self.decode(code))])
+
+    def copy(self) -> DenseStorage:
+        clone: DenseStorage = cast(DenseStorage, self.__class__.__new__(self.__class__))
+        clone.__dict__.update(self.__dict__)
+        clone.buffer = self.detached()
+        return clone
+
+    def detached(self) -> Any:
+        """A copy of the buffer that doesn't share memory with it, even if it's a view of a memory mapped file"""
+
+        if isinstance(self.buffer, memoryview):
+            return bytearray(self.buffer) if self.buffer.format == 'B' else array(self.buffer.format, self.buffer)
+        return self.buffer.copy() if hasattr(self.buffer, 'copy') else self.buffer[:]
+
+    def __getstate__(self) -> dict[str, Any]:
+        if isinstance(self.buffer, memoryview):
+            return {**self.__dict__, 'buffer': self.detached()}
+        return self.__dict__
+
+    @property
+    def typecode(self) -> str:
+        """The type of each cell in the buffer, as an array type code"""
+        return self.buffer.format if isinstance(self.buffer, memoryview) else self.buffer.typecode
+
+
+class ByteStorage(DenseStorage):
+    """Dense storage for single-character values, one byte per cell, with NUL for empty cells"""
+
+    def __init__(self, min_row: int, min_col: int, rows: int, cols: int, buffer: Optional[bytearray] = None) -> None:
+        super().__init__(min_row, min_col, rows, cols, bytearray(rows * cols) if buffer is None else buffer, 0)
+
+    def occupied(self) -> int:
+        # A memory mapped buffer is a memoryview, which can't count its cells
+        cells: Any = self.buffer.tobytes() if isinstance(self.buffer, memoryview) else self.buffer
+        return len(cells) - cells.count(0)
+
+    def encode(self, value: Any) -> int:
+        return ord(value)
+
+    def decode(self, cell: int) -> str:
+        return CHARS[cell]
+
+    def get(self, key: GridPosition, default: Any = None) -> Any:
+        row: int = int(key.real) - self.min_row
+        col: int = int(key.imag) - self.min_col
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            cell: int = self.buffer[row * self.cols + col]
+            if cell:
+                return CHARS[cell]
+        return default
+
+    def indices(self) -> Iterator[int]:
+        if not self.count:
+            return iter(())
+        return (index for index, cell in enumerate(self.buffer) if cell)
+
+    def find(self, value: Any) -> list[GridPosition]:
+        found: list[GridPosition] = []
+        target: bytes = bytes([ord(value)])
+        buffer: Any = self.buffer.obj if isinstance(self.buffer, memoryview) else self.buffer
+        index: int = buffer.find(target)
+        while index >= 0:
+            found.append(self.position(index))
+            index = buffer.find(target, index + 1)
+        return found
+
+    @property
+    def typecode(self) -> str:
+        return 'B'
+
+    def clear(self) -> None:
+        self.buffer[:] = bytes(len(self.buffer))
+        self.count = 0
+
+    @property
+    def array(self) -> Any:
+        return numpy.frombuffer(self.buffer, dtype=numpy.uint8).reshape(self.rows, self.cols)
+
+    @staticmethod
+    def accepts(values: dict[str, Any]) -> bool:
+        """True if every value is a character that fits in a byte"""
+        return all(isinstance(value, str) and len(value) == 1 and 0 < ord(value) < 256 for value in values.values())
+
+    def load(self, lines: list[str], values: dict[str, Any], offset: int, flip: int) -> None:
+        """Copy rows of characters straight into the buffer, translating them (and blanking the rest) in one pass"""
+
+        table: bytes = bytes(ord(values[CHARS[code]]) if CHARS[code] in values else 0 for code in range(256))
+        for row, line in enumerate(lines, offset):
+            r: int = flip - row if flip else row
+            start: int = (r - self.min_row) * self.cols + offset - self.min_col
+            self.buffer[start:start + len(line)] = line.encode('latin-1').translate(table)
+        self.count = self.occupied()
+
+
+class ArrayStorage(DenseStorage):
+    """Dense storage for small integers in an array, using the type's minimum value for empty cells"""
+
+    def __init__(self, min_row: int, min_col: int, rows: int, cols: int, typecode: str = 'b', buffer: Optional[array] = None) -> None:
+        empty: int = -1 << (array(typecode).itemsize * 8 - 1)
+        super().__init__(min_row, min_col, rows, cols, array(typecode, [empty]) * (rows * cols) if buffer is None else buffer, empty)
+
+    def occupied(self) -> int:
+        # A memory mapped buffer is a memoryview, which can't count its cells
+        cells: Any = self.buffer.tolist() if isinstance(self.buffer, memoryview) else self.buffer
+        return len(cells) - cells.count(self.empty)
+
+    def find(self, value: Any) -> list[GridPosition]:
+        return [self.position(index) for index, cell in enumerate(self.buffer) if cell == value]
+
+    def clear(self) -> None:
+        self.buffer[:] = array(self.typecode, [self.empty]) * len(self.buffer)
+        self.count = 0
+
+
+class NumpyStorage(DenseStorage):
+    """Dense storage for numbers in a numpy array, using the type's minimum value for empty cells"""
+
+    def __init__(self, min_row: int, min_col: int, rows: int, cols: int, typecode: str = 'q', buffer: Any = None) -> None:
+        if numpy is None:
+            raise ImportError('numpy storage needs numpy to be installed')
+        empty: int = numpy.iinfo(typecode).min
+        super().__init__(min_row, min_col, rows, cols, numpy.full(rows * cols, empty, dtype=typecode) if buffer is None else buffer, empty)
+
+    def occupied(self) -> int:
+        return int(numpy.count_nonzero(self.buffer != self.empty))
+
+    def decode(self, cell: Any) -> Any:
+        return cell.item()
+
+    def indices(self) -> Iterator[int]:
+        return iter(numpy.flatnonzero(self.buffer != self.empty).tolist())
+
+    def find(self, value: Any) -> list[GridPosition]:
+        return [self.position(index) for index in numpy.flatnonzero(self.buffer == value).tolist()]
+
+    def clear(self) -> None:
+        self.buffer.fill(self.empty)
+        self.count = 0
+
+    @property
+    def array(self) -> Any:
+        return self.buffer.reshape(self.rows, self.cols)
+
+    @property
+    def typecode(self) -> str:
+        return self.buffer.dtype.str
+
+
+class OverlayStorage(MutableMapping):
+    """Copy-on-write cell storage for a Grid snapshot: changes are kept apart from the shared base, which is never modified"""
+
+    def __init__(self, base: MutableMapping, bounds: tuple[int, ...] = ()) -> None:
+        self.base: MutableMapping = base
+        self.bounds: tuple[int, ...] = bounds
+        self.changes: dict[GridPosition, Any] = {}
+        self.count: int = len(base)
+
+    def get(self, key: GridPosition, default: Any = None) -> Any:
+        value: Any = self.changes.get(key, MISSING)
+        if value is MISSING:
+            return self.base.get(key, default)
+        return default if value is DELETED else value
+
+    def __getitem__(self, key: GridPosition) -> Any:
+        value: Any = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: GridPosition, value: Any) -> None:
+        if self.dense:
+            if value is None:
+                self.pop(key, None)
+                return
+            if self.base.index(key) < 0:
+                raise IndexError(f'{key} is outside of the dense grid')
+        if key not in self:
+            self.count += 1
+        self.changes[key] = value
+
+    def __delitem__(self, key: GridPosition) -> None:
+        if key not in self:
+            raise KeyError(key)
+        if key in self.base:
+            self.changes[key] = DELETED
+        else:
+            del self.changes[key]
+        self.count -= 1
+
+    def __contains__(self, key: object) -> bool:
+        value: Any = self.changes.get(key, MISSING)  # type: ignore
+        if value is MISSING:
+            return key in self.base
+        return value is not DELETED
+
+    def __iter__(self) -> Iterator[GridPosition]:
+        changes: dict[GridPosition, Any] = self.changes
+        for key in self.base:
+            if changes.get(key, MISSING) is not DELETED:
+                yield key
+        for key, value in changes.items():
+            if value is not DELETED and key not in self.base:
+                yield key
+
+    def __len__(self) -> int:
+        return self.count
+
+    def copy(self) -> OverlayStorage:
+        clone: OverlayStorage = OverlayStorage(self.base, self.bounds)
+        clone.changes = self.changes.copy()
+        clone.count = self.count
+        return clone
+
+    def clear(self) -> None:
+        self.changes = dict.fromkeys(self.base, DELETED)
+        self.count = 0
+
+    @property
+    def dense(self) -> bool:
+        """True if the snapshot is of dense storage (perhaps through other snapshots)"""
+        return isinstance(self.base, DenseStorage) or (isinstance(self.base, OverlayStorage) and self.base.dense)
+
+    def index(self, key: GridPosition) -> int:
+        """The index of a position in a dense base, or -1 if it's outside of it (or the base isn't dense)"""
+        return self.base.index(key) if self.dense else -1  # type: ignore
+
+    def diff(self) -> dict[GridPosition, tuple[Any, Any]]:
+        """The (old, new) values of every cell that differs from the base, with None for an empty cell"""
+
+        changed: dict[GridPosition, tuple[Any, Any]] = {}
+        for key, value in self.changes.items():
+            old: Any = self.base.get(key, None)
+            new: Any = None if value is DELETED else value
+            if old != new or (key in self.base) != (value is not DELETED):
+                changed[key] = (old, new)
+        return changed
+
+    def rollback(self) -> None:
+        """Discard every change"""
+        self.changes = {}
+        self.count = len(self.base)
+
+
+STORAGE: dict[str, type[DenseStorage]] = {
+    'bytes': ByteStorage,
+    'array': ArrayStorage,
+    'numpy': NumpyStorage,
+}
+
+
 class Grid(MutableMapping):
     """Two-Dimensional Grid backed by a hash map with complex keys for locations"""
 
@@ -63,12 +456,18 @@ class Grid(MutableMapping):
         '_dynamic',
     ]
 
-    def __init__(self, source: Optional[list[str] | Grid] = None, **keywords) -> None:
+    def __new__(cls, *args, **keywords) -> Grid:
+        chosen: tuple[type[GridVariant], ...] = tuple(behavior for behavior in VARIANTS if keywords.get(behavior.keyword, False))
+        if chosen:
+            cls = variant(cls, chosen)
+        return super().__new__(cls)
+
+    def __init__(self, source: Optional[list[str] | list[bytes] | Grid] = None, **keywords) -> None:
         """
         Grid constructor
 
-        :param source: Either a list of strings representing the initial data, or another Grid
-        :type source: Optional[list[str] | Grid]
+        :param source: Either a list of strings (or bytes) representing the initial data, or another Grid
+        :type source: Optional[list[str] | list[bytes] | Grid]
         :param keywords: Modify Grid behavior, as follows:
 
         * sparse: bool = False, If True, then only non-None values will be stored in the Grid.
@@ -79,26 +478,31 @@ class Grid(MutableMapping):
         * empty: bool = False, If True, when initializing from another Grid, will start with an empty grid instead of copying data.
         * transpose: bool = False, If True, when initializing, swap the row and column addresses.
         * conversion: Callable = None, If set, use this conversion on each element as the Grid is initialized
+        * table: Mapping = None, If set, translate each character (or character code) through this table instead
+        * storage: str = 'dict', How cells are stored: 'dict', or dense 'bytes' (characters), 'array' or 'numpy' (numbers)
+        * typecode: str = None, The array or numpy type code for numeric dense storage ('b' and 'q' by default)
+        * instrument: bool = False, If True, create an InstrumentedGrid that counts operations (see GridStats)
+        * call_sites: bool = False, If True, an InstrumentedGrid also counts operations by the line that called them
+        * index: bool = False, If True, create an IndexedGrid that indexes the positions of each value
         """
 
-        self._grid: dict[GridPosition, Any] = {}
+        self._grid: dict[GridPosition, Any] | DenseStorage = {}
 
         self._min_row: int = 1_000_000_000_000
         self._max_row: int = -1_000_000_000_000
         self._min_col: int = 1_000_000_000_000
         self._max_col: int = -1_000_000_000_000
 
-        self._getop = 0
-        self._setop = 0
-        self._delop = 0
-
         if source is None:
             self._rows: int = keywords.get('rows', 0)
             self._cols: int = keywords.get('cols', 0)
             self._init(**keywords)
+            self._grid = self._allocate()
         elif issubclass(source.__class__, Grid):
             for p in self._properties:
                 setattr(self, p, getattr(source, p))
+            self._storage: str = keywords.get('storage', source._storage)
+            self._typecode: Optional[str] = keywords.get('typecode', source._typecode)
             # self._init(**keywords)
             if 'offset' in keywords:
                 self._offset = keywords['offset']
@@ -111,8 +515,15 @@ class Grid(MutableMapping):
             if 'dynamic' in keywords:
                 self._dynamic = keywords['dynamic']
             empty: bool = keywords.get('empty', False)
-            if not empty:
+            if self._storage != source._storage or self._typecode != source._typecode:
+                self._grid = self._allocate()
+                if not empty:
+                    self._grid.update(source._grid)
+            elif empty:
+                self._grid = self._allocate()
+            else:
                 self._grid = source._grid.copy()  # type: ignore
+            if not empty:
                 if self._dynamic:
                     for p in ['_min_row', '_max_row', '_min_col', '_max_col']:
                         setattr(self, p, getattr(source, p))
@@ -122,6 +533,9 @@ class Grid(MutableMapping):
         elif isinstance(source, str):
             self._init(**keywords)
             self._parse(source.strip().split('\n'), **keywords)
+        elif isinstance(source, (bytes, bytearray)):
+            self._init(**keywords)
+            self._parse(source.strip().splitlines(), **keywords)
         else:
             raise ValueError('Invalid source: {source}')
 
@@ -131,30 +545,107 @@ class Grid(MutableMapping):
         self._origin: str = keywords.get('origin', 'ul')
         self._default: Any = keywords.get('default', None)
         self._dynamic: bool = keywords.get('dynamic', False)
+        self._storage: str = keywords.get('storage', 'dict')
+        self._typecode: Optional[str] = keywords.get('typecode', None)
+
+    def _allocate(self) -> dict[GridPosition, Any] | DenseStorage:
+        """Create empty storage for the grid, covering its bounds plus the offset in all directions"""
+
+        if self._storage == 'dict':
+            return {}
+        if self._storage not in STORAGE:
+            raise ValueError(f'Invalid storage: {self._storage}')
+        if self._dynamic:
+            raise ValueError('Dense storage needs fixed grid boundaries')
+
+        margin: int = 2 * self._offset + (1 if self._origin == 'll' else 0)
+        bounds: tuple[int, int, int, int] = (0, 0, self._rows + margin, self._cols + margin)
+        if self._typecode:
+            return STORAGE[self._storage](*bounds, typecode=self._typecode)  # type: ignore
+        return STORAGE[self._storage](*bounds)
+
+    def _parse(self, source: list[str] | list[bytes], **keywords) -> None:
+        """Load rows of characters in bulk, converting each distinct character once and computing bounds at the end"""
 
-    def _parse(self, source: list[str], **keywords) -> None:
         transpose: bool = keywords.get('transpose', False)
         conversion: Callable = keywords.get('conversion', None)  # type: ignore
+        table: Mapping = keywords.get('table', None)  # type: ignore
 
-        rows: int = len(source)
-        cols: int = len(source[0])
+        lines: list[str] = [line.decode('latin-1') if isinstance(line, (bytes, bytearray)) else line for line in source]
+
+        rows: int = len(lines)
+        cols: int = len(lines[0])
 
         self._rows: int = cols if transpose else rows
         self._cols: int = rows if transpose else cols
+        self._grid = self._allocate()
 
-        for row, line in enumerate(source):
-            for col, value in enumerate(line):
-                r, c = row + self._offset, col + self._offset
-                if transpose:
-                    r, c = c, r
-                if self._origin == 'll':
+        values: dict[str, Any] = self._translation(set().union(*lines), table, conversion)
+        if self._sparse:
+            values = {ch: value for ch, value in values.items() if value is not None}
+
+        if isinstance(self._grid, ByteStorage) and not transpose and max(map(len, lines)) <= cols and self._grid.accepts(values):
+            self._grid.load(lines, values, self._offset, self._rows + self._offset if self._origin == 'll' else 0)
+        else:
+            for row, line in enumerate(lines):
+                r: int = row + self._offset
+                if self._origin == 'll' and not transpose:
                     r = self._rows + self._offset - r
+                if transpose:
+                    cells: Iterator = ((c, ch) for c, ch in enumerate(line, self._offset) if ch in values)
+                    if self._origin == 'll':
+                        self._grid.update((GridPosition(self._rows + self._offset - c, r), values[ch]) for c, ch in cells)
+                    else:
+                        self._grid.update((GridPosition(c, r), values[ch]) for c, ch in cells)
+                else:
+                    self._grid.update((GridPosition(r, c), values[ch]) for c, ch in enumerate(line, self._offset) if ch in values)
 
-                if conversion:
-                    value = conversion(value)
+        if self._dynamic:
+            self._extend(self._grid.keys())
 
-                if not (self._sparse and value is None):
-                    self[GridPosition(r, c)] = value
+    @staticmethod
+    def _translation(chars: set[str], table: Optional[Mapping], conversion: Optional[Callable]) -> dict[str, Any]:
+        """Map each character to its cell value, using a translation table (keyed by character or code) or a conversion"""
+
+        if table is not None:
+            return {ch: table.get(ch, table.get(ord(ch), ch)) for ch in chars}
+        if conversion:
+            return {ch: conversion(ch) for ch in chars}
+        return {ch: ch for ch in chars}
+
+    def _extend(self, positions: Iterable[GridPosition]) -> None:
+        """Grow the boundaries of a dynamic grid to include every position"""
+
+        rows: list[int] = [GridRow(position) for position in positions]
+        cols: list[int] = [GridCol(position) for position in positions]
+        if rows:
+            self._min_row = min(self._min_row, min(rows))
+            self._max_row = max(self._max_row, max(rows))
+            self._min_col = min(self._min_col, min(cols))
+            self._max_col = max(self._max_col, max(cols))
+            self._rows = self._max_row - self._min_row + 1
+            self._cols = self._max_col - self._min_col + 1
+
+    @classmethod
+    def from_points(cls, points: Iterable[GridPosition | tuple[int, int]], value: Any = True, **keywords) -> Grid:
+        """
+        Create a grid holding the same value at every point, such as a list of (row, col) coordinates
+
+        A fixed-size grid is sized to hold every point, unless rows and cols are given.
+        """
+
+        positions: list[GridPosition] = [GridPosition(*p) if isinstance(p, tuple) else p for p in points]
+        if not keywords.get('dynamic', False) and positions:
+            keywords.setdefault('rows', max(map(GridRow, positions)) + 1 - keywords.get('offset', 0))
+            keywords.setdefault('cols', max(map(GridCol, positions)) + 1 - keywords.get('offset', 0))
+
+        grid: Grid = cls(**keywords)
+        grid._grid.update(dict.fromkeys(positions, value))
+        if grid._dynamic:
+            grid._extend(positions)
+        if isinstance(grid, GridVariant):
+            grid._reset()
+        return grid
 
     def __repr__(self) -> str:
         return f'{self.__class__.__name__}({self._rows}, {self._cols})'
@@ -163,12 +654,14 @@ class Grid(MutableMapping):
         if isinstance(key, tuple):
             key = GridPosition(*key)
         if isinstance(key, GridPosition):
-            if key in self._grid:
-                self._getop += 1
-                return self._grid[key]
+            value: Any = self._grid.get(key, MISSING)
+            if value is not MISSING:
+                return value
             elif self._sparse:
-                self._getop += 1
                 return self._default
+            elif isinstance(self._grid, (DenseStorage, OverlayStorage)) and self._grid.index(key) >= 0:
+                # Dense storage can't hold None, so an empty cell within the bounds reads as None, as it would from a dict
+                return None
             else:
                 raise IndexError
         raise KeyError
@@ -178,7 +671,6 @@ class Grid(MutableMapping):
             key = GridPosition(*key)
         if isinstance(key, GridPosition):
             self._grid[key] = value
-            self._setop += 1
             if self._dynamic:
                 self._min_row = min(self._min_row, GridRow(key))
                 self._max_row = max(self._max_row, GridRow(key))
@@ -195,10 +687,8 @@ class Grid(MutableMapping):
         if isinstance(key, GridPosition):
             if key in self._grid:
                 del self._grid[key]
-                self._delop += 1
                 return
             elif self._sparse:
-                self._delop += 1
                 return
             else:
                 raise IndexError
@@ -210,8 +700,8 @@ class Grid(MutableMapping):
     def __len__(self) -> int:
         return len(self._grid)
 
-    def __iter__(self) -> KeysView[GridPosition]:
-        return KeysView(self._grid)
+    def __iter__(self) -> Iterator[GridPosition]:
+        return iter(self._grid)
 
     def __eq__(self, other: Grid) -> bool:
         if any([getattr(self, p) != getattr(other, p) for p in self._properties]):
@@ -247,8 +737,16 @@ class Grid(MutableMapping):
         self._grid.clear()
 
     def find(self, value) -> list[GridPosition]:
+        if isinstance(self._grid, DenseStorage):
+            return self._grid.find(value)
         return [key for key, val in self._grid.items() if val == value]
 
+    def count(self, value: Any) -> int:
+        return len(self.find(value))
+
+    def positions(self, value: Any) -> Iterator[GridPosition]:
+        return iter(self.find(value))
+
     @property
     def rows(self) -> int:
         return self._rows
@@ -283,15 +781,164 @@ class Grid(MutableMapping):
     def lines(self) -> list[str]:
         return [self.render_row(r) for r in self.row_range]
 
-    @property
-    def operations(self) -> Mapping:
-        return {'set': self._setop, 'get': self._getop, 'del': self._delop}
-
     def render(self, value: Any) -> str:
         return ' ' if value is None else str(value)[0]
 
     def render_row(self, row: int) -> str:
-        return ''.join([self.render(v) for v in self.row(row)])
+        return ''.join(map(self.render, self.row_view(row)))
+
+    def row_view(self, r: int) -> GridView:
+        """A lazy view of a row, across the column range"""
+        return GridView(self, GridPosition(r, self.col_range.start), EAST, len(self.col_range))
+
+    def col_view(self, c: int) -> GridView:
+        """A lazy view of a column, down the row range"""
+        return GridView(self, GridPosition(self.row_range.start, c), SOUTH, len(self.row_range))
+
+    def window(self, corner: GridPosition, rows: int, cols: int) -> GridWindow:
+        """A lazy view of the rectangle of rows x cols cells with its upper left at corner"""
+        return GridWindow(self, corner, rows, cols)
+
+    def snapshot(self) -> Grid:
+        """
+        A copy of the grid that shares its cells, keeping only its own changes (copy-on-write)
+
+        Taking a snapshot costs the same for any size of grid, and the snapshot pays only for the cells it changes,
+        but it sees any later changes to this grid's cells, so leave the original alone while snapshots are in use.
+        Subclasses with state of their own derived from the cells give their snapshots a copy of it here.
+        """
+
+        clone: Grid = self.__class__.__new__(self.__class__)
+        clone.__dict__.update(self.__dict__)
+        clone._grid = OverlayStorage(self._grid, (self._min_row, self._max_row, self._min_col, self._max_col, self._rows, self._cols))
+        return clone
+
+    @property
+    def overlay(self) -> OverlayStorage:
+        if not isinstance(self._grid, OverlayStorage):
+            raise ValueError('Only snapshots track their changes')
+        return self._grid
+
+    def diff(self) -> dict[GridPosition, tuple[Any, Any]]:
+        """The (old, new) values of every cell a snapshot has changed, with None for an empty cell"""
+        return self.overlay.diff()
+
+    def rollback(self) -> None:
+        """Discard every change made to a snapshot, returning it to the state of the grid it was taken from"""
+        self.overlay.rollback()
+        self._min_row, self._max_row, self._min_col, self._max_col, self._rows, self._cols = self.overlay.bounds
+
+    def save(self, path: str) -> None:
+        """
+        Save the grid in a compact binary file: a JSON header, followed by the dense buffer or the pickled cells
+
+        Dense buffers start on a page boundary, so that load() can memory map them.
+        """
+
+        header: dict[str, Any] = {p: self._encode(getattr(self, p)) for p in self._properties}
+        header.update(
+            storage=self._storage if isinstance(self._grid, (dict, DenseStorage)) else 'dict', typecode=self._typecode,
+            bounds=[self._min_row, self._max_row, self._min_col, self._max_col],
+            variants=[behavior.keyword for behavior in variants(self.__class__)],
+        )
+
+        if isinstance(self._grid, DenseStorage):
+            storage: DenseStorage = self._grid
+            payload: bytes | memoryview = memoryview(storage.buffer).cast('B')
+            header.update(geometry=[storage.min_row, storage.min_col, storage.rows, storage.cols], cells=storage.typecode, count=storage.count)
+        else:
+            # Store the rows and columns of the cells as arrays of machine integers, which are far smaller than complex keys
+            rows: list[int] = [GridRow(position) for position in self._grid]
+            cols: list[int] = [GridCol(position) for position in self._grid]
+            typecode: str = 'i' if -2**31 <= min(rows + cols, default=0) and max(rows + cols, default=0) < 2**31 else 'q'
+            cells: tuple = (array(typecode, rows), array(typecode, cols), list(self._grid.values()))
+            payload = pickle.dumps(cells, protocol=pickle.HIGHEST_PROTOCOL)
+
+        encoded: bytes = json.dumps(header).encode()
+        start: int = len(GRID_MAGIC) + 4 + len(encoded)
+        if isinstance(self._grid, DenseStorage):
+            start += -start % ALLOCATIONGRANULARITY
+
+        with open(path, 'wb') as gf:
+            gf.write(GRID_MAGIC)
+            gf.write(len(encoded).to_bytes(4, 'little'))
+            gf.write(encoded)
+            gf.write(bytes(start - gf.tell()))
+            gf.write(payload)
+
+    @staticmethod
+    def _encode(value: Any) -> Any:
+        """A form of a setting (such as the default) that JSON can encode: plain values as they are, others pickled"""
+
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        try:
+            return {'pickle': b64encode(pickle.dumps(value)).decode('ascii')}
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError(f'Unable to save the grid setting {value!r}: {e}') from None
+
+    @staticmethod
+    def _decode(value: Any) -> Any:
+        return pickle.loads(b64decode(value['pickle'])) if isinstance(value, dict) else value
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False) -> Grid:
+        """
+        Load a grid saved by save()
+
+        With mmap, a dense buffer is memory mapped copy-on-write instead of being read, so that opening a large grid
+        costs the same as opening a small one; pages are read as they're used, and changes aren't saved to the file.
+        """
+
+        with open(path, 'rb') as gf:
+            if gf.read(len(GRID_MAGIC)) != GRID_MAGIC:
+                raise ValueError(f'{path} is not a saved Grid')
+            size: int = int.from_bytes(gf.read(4), 'little')
+            header: dict[str, Any] = json.loads(gf.read(size))
+            start: int = len(GRID_MAGIC) + 4 + size
+
+            chosen: tuple[type[GridVariant], ...] = tuple(b for b in VARIANTS if b.keyword in header.get('variants', ()))
+            grid: Grid = variant_grid(cls, chosen)
+            for p in cls._properties:
+                setattr(grid, p, cls._decode(header[p]))
+            grid._storage, grid._typecode = header['storage'], header['typecode']
+            grid._min_row, grid._max_row, grid._min_col, grid._max_col = header['bounds']
+
+            if grid._storage == 'dict':
+                gf.seek(start)
+                rows, cols, values = pickle.load(gf)
+                grid._grid = dict(zip(map(GridPosition, rows, cols), values))
+            else:
+                start += -start % ALLOCATIONGRANULARITY
+                if mmap and header['geometry'][2] * header['geometry'][3]:
+                    buffer: Any = memoryview(memory_map(gf.fileno(), 0, access=ACCESS_COPY, offset=start))
+                else:
+                    gf.seek(start)
+                    buffer = bytearray(gf.read())
+                grid._grid = cls._restore(grid._storage, header, buffer)
+
+        if isinstance(grid, GridVariant):
+            grid._reset()
+        return grid
+
+    @staticmethod
+    def _restore(kind: str, header: dict[str, Any], buffer: Any) -> DenseStorage:
+        """Rebuild dense storage around a buffer loaded from a saved grid"""
+
+        typecode: str = header['cells']
+        storage: DenseStorage = cast(DenseStorage, STORAGE[kind].__new__(STORAGE[kind]))
+        storage.min_row, storage.min_col, storage.rows, storage.cols = header['geometry']
+        if kind == 'numpy':
+            storage.buffer = numpy.frombuffer(buffer, dtype=typecode)
+            storage.empty = numpy.iinfo(storage.buffer.dtype).min
+        elif kind == 'array':
+            storage.buffer = memoryview(buffer).cast(typecode) if isinstance(buffer, memoryview) else array(typecode, bytes(buffer))
+            storage.empty = -1 << (array(typecode).itemsize * 8 - 1)
+        else:
+            storage.buffer = buffer
+            storage.empty = 0
+        storage.count = header['count']
+        return storage
 
     def row(self, r: int) -> list[Any]:
         return [self[GridPosition(r, c)] for c in self.col_range]
@@ -302,6 +949,73 @@ class Grid(MutableMapping):
     def inbounds(self, position: GridPosition) -> bool:
         return (GridRow(position) in self.row_range and GridCol(position) in self.col_range)
 
+    def where(self, predicate: Callable[[Any], bool]) -> Iterator[GridPosition]:
+        """Yield the position of every stored cell whose value matches the predicate"""
+
+        if numpy is not None and isinstance(self._grid, DenseStorage):
+            return map(self._grid.position, numpy.flatnonzero(self._grid.mask(predicate)).tolist())
+        return (position for position, value in self._grid.items() if predicate(value))
+
+    def neighbor_counts(self, kernel: int | Iterable[GridDirection] | Mapping[GridDirection, int] = 8,
+                        predicate: Optional[Callable[[Any], bool]] = None) -> Grid:
+        """
+        Count the neighbors of every position in one pass, returning a sparse Grid of counts (defaulting to 0)
+
+        :param kernel: 4 or 8 for the orthogonal or adjacent neighbors, a list of directions, or a map of directions to weights
+        :param predicate: If set, only count neighbors whose values match, otherwise count every stored cell
+
+        Counts are also kept for empty positions, including those just outside the grid boundaries.
+        """
+
+        weights: Mapping[GridDirection, int] = self._kernel(kernel)
+        if numpy is not None and isinstance(self._grid, DenseStorage):
+            return self._convolve(weights, predicate)
+
+        # Each matching cell adds its weight to the positions that see it as a neighbor
+        positions: list[GridPosition] = list(self._grid) if predicate is None else list(self.where(predicate))
+        counts: Counter[GridPosition] = Counter()
+        for direction, weight in weights.items():
+            shifted: Iterator[GridPosition] = map((-direction).__add__, positions)
+            if weight == 1:
+                counts.update(shifted)
+            else:
+                for position in shifted:
+                    counts[position] += weight
+
+        field: Grid = Grid(self, empty=True, sparse=True, default=0, storage='dict')
+        field._grid = dict(counts)
+        if field._dynamic:
+            field._extend(field._grid)
+        return field
+
+    def _convolve(self, weights: Mapping[GridDirection, int], predicate: Optional[Callable[[Any], bool]]) -> Grid:
+        """Count neighbors by adding shifted copies of the matching-cell mask of a dense grid"""
+
+        storage: DenseStorage = cast(DenseStorage, self._grid)
+        mask: Any = storage.mask(predicate).astype(numpy.int64)
+        pad: int = max(max(abs(GridRow(direction)), abs(GridCol(direction))) for direction in weights)
+        padded: Any = numpy.pad(mask, pad)
+
+        counts: Any = numpy.zeros_like(mask)
+        for direction, weight in weights.items():
+            row, col = pad + GridRow(direction), pad + GridCol(direction)
+            counts += weight * padded[row:row + storage.rows, col:col + storage.cols]
+
+        field: Grid = Grid(self, empty=True, sparse=True, default=0, storage='dict')
+        field._storage, field._typecode = 'numpy', 'q'
+        field._grid = NumpyStorage(storage.min_row, storage.min_col, storage.rows, storage.cols, buffer=counts.ravel())
+        return field
+
+    @staticmethod
+    def _kernel(kernel: int | Iterable[GridDirection] | Mapping[GridDirection, int]) -> Mapping[GridDirection, int]:
+        if isinstance(kernel, int):
+            if kernel not in (4, 8):
+                raise ValueError(f'Invalid neighborhood: {kernel}')
+            kernel = ORTHOGONAL if kernel == 4 else ADJACENT
+        if isinstance(kernel, Mapping):
+            return kernel
+        return dict.fromkeys(kernel, 1)
+
     @staticmethod
     def conv_blank(blank: str = ' '):
         def conversion(char: str) -> Any:
@@ -309,7 +1023,663 @@ class Grid(MutableMapping):
         return conversion
 
 
+class GridView(Sequence):
+    """A lazy view of a line of cells in a Grid (such as a row or column), which reads and writes through to the Grid"""
+
+    def __init__(self, grid: Grid, start: GridPosition, step: GridDirection, length: int) -> None:
+        self.grid: Grid = grid
+        self.start: GridPosition = start
+        self.step: GridDirection = step
+        self.length: int = max(0, length)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.start}, {self.step}, {self.length})'
+
+    def __len__(self) -> int:
+        return self.length
+
+    def position(self, index: int) -> GridPosition:
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError(index)
+        return self.start + index * self.step
+
+    @property
+    def positions(self) -> Iterator[GridPosition]:
+        return (self.start + index * self.step for index in range(self.length))
+
+    def __getitem__(self, index: int | slice) -> Any:  # type: ignore
+        if isinstance(index, slice):
+            first, _, stride = index.indices(self.length)
+            return GridView(self.grid, self.start + first * self.step, self.step * stride, len(range(*index.indices(self.length))))
+        return self.grid[self.position(index)]
+
+    def __setitem__(self, index: int, value: Any) -> None:
+        self.grid[self.position(index)] = value
+
+    def __iter__(self) -> Iterator[Any]:
+        return map(self.grid.__getitem__, self.positions)
+
+    @property
+    def memory(self) -> memoryview:
+        """A memoryview of the cells in a dense grid's buffer, without copying them"""
+
+        storage: Any = self.grid._grid
+        if not isinstance(storage, DenseStorage):
+            raise TypeError('Only grids with dense storage have memory views')
+
+        stride: int = GridRow(self.step) * storage.cols + GridCol(self.step)
+        if stride <= 0:
+            raise ValueError('Memory views must run forwards through the buffer, such as east or south')
+        if not self.length:
+            return memoryview(storage.buffer)[0:0]
+
+        first: int = storage.index(self.start)
+        last: int = storage.index(self.start + (self.length - 1) * self.step)
+        if first < 0 or last < 0:
+            raise IndexError(f'{self} is not inside of the dense storage')
+        return memoryview(storage.buffer)[first:last + 1:stride]
+
+
+class GridWindow(Sequence):
+    """A lazy view of a rectangle of cells in a Grid, as a sequence of row views"""
+
+    def __init__(self, grid: Grid, corner: GridPosition, rows: int, cols: int) -> None:
+        self.grid: Grid = grid
+        self.corner: GridPosition = corner
+        self.rows: int = rows
+        self.cols: int = cols
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.corner}, {self.rows}, {self.cols})'
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, index: int | slice | tuple[int, int]) -> Any:  # type: ignore
+        if isinstance(index, tuple):
+            return self[index[0]][index[1]]
+        if isinstance(index, slice):
+            first, stop, stride = index.indices(self.rows)
+            if stride != 1:
+                raise ValueError('Windows can only be sliced contiguously')
+            return GridWindow(self.grid, self.corner + first * SOUTH, max(0, stop - first), self.cols)
+        if index < 0:
+            index += self.rows
+        if not 0 <= index < self.rows:
+            raise IndexError(index)
+        return GridView(self.grid, self.corner + index * SOUTH, EAST, self.cols)
+
+    def __setitem__(self, index: tuple[int, int], value: Any) -> None:
+        self[index[0]][index[1]] = value
+
+    def col(self, index: int) -> GridView:
+        """A view of one column of the window"""
+        return GridView(self.grid, self.corner + index * EAST, SOUTH, self.rows)
+
+    def window(self, corner: GridPosition, rows: int, cols: int) -> GridWindow:
+        """A smaller window, with its corner relative to this one"""
+        return GridWindow(self.grid, self.corner + corner, min(rows, self.rows - GridRow(corner)), min(cols, self.cols - GridCol(corner)))
+
+    @property
+    def positions(self) -> Iterator[GridPosition]:
+        return (position for row in self for position in row.positions)
+
+    @property
+    def lines(self) -> list[str]:
+        return [''.join(map(self.grid.render, row)) for row in self]
+
+    @property
+    def memory(self) -> list[memoryview]:
+        """memoryviews of each row of the window in a dense grid's buffer"""
+        return [row.memory for row in self]
+
+
+class CompressedGrid(Grid):
+    """
+    Grid over compressed coordinates, for a few points spread over a huge area
+
+    Each distinct row (or column) value among the points is one compressed row (or column), and each gap between
+    them is another, weighted by the number of real rows (or columns) it stands for. The grid itself is addressed
+    by compressed position, so printable, lines and the other Grid methods show the compressed layout; the methods
+    below take real positions.
+    """
+
+    def __init__(self, points: Iterable[GridPosition | tuple[int, int]] = (), **keywords) -> None:
+        """
+        CompressedGrid constructor
+
+        :param points: The positions (or (row, col) tuples) whose rows and columns are kept
+        :param keywords: As for Grid, plus:
+
+        * margin: int = 0, If set, add a row and column this far beyond the points on every side
+        """
+
+        positions: list[GridPosition] = [GridPosition(*p) if isinstance(p, tuple) else p for p in points]
+        margin: int = keywords.pop('margin', 0)
+        self._row_starts, self._row_weights = self._axis({GridRow(p) for p in positions}, margin)
+        self._col_starts, self._col_weights = self._axis({GridCol(p) for p in positions}, margin)
+        self._tables: dict[Optional[Callable], list[list[int]]] = {}
+
+        keywords.update(rows=len(self._row_starts), cols=len(self._col_starts), dynamic=False)
+        keywords.setdefault('sparse', True)
+        super().__init__(**keywords)
+
+    @staticmethod
+    def _axis(values: set[int], margin: int) -> tuple[list[int], list[int]]:
+        """The first real value of each compressed row or column, and how many real values it covers"""
+
+        ordered: list[int] = sorted(values)
+        if margin and ordered:
+            ordered = [ordered[0] - margin] + ordered + [ordered[-1] + margin]
+
+        starts: list[int] = []
+        weights: list[int] = []
+        for value, following in zip(ordered, ordered[1:] + ordered[-1:]):
+            starts.append(value)
+            weights.append(1)
+            if following > value + 1:
+                starts.append(value + 1)
+                weights.append(following - value - 1)
+        return starts, weights
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Summed-area tables are keyed by predicates, which may not pickle
+        return {**self.__dict__, '_tables': {}}
+
+    def snapshot(self) -> CompressedGrid:
+        clone: CompressedGrid = super().snapshot()  # type: ignore
+        clone._tables = {}
+        return clone
+
+    def rollback(self) -> None:
+        self._tables.clear()
+        super().rollback()
+
+    def __setitem__(self, key: GridPosition | tuple[int, int], value: Any) -> None:
+        self._tables.clear()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: GridPosition | tuple[int, int]) -> None:
+        self._tables.clear()
+        super().__delitem__(key)
+
+    def clear(self) -> None:
+        self._tables.clear()
+        super().clear()
+
+    def compress(self, position: GridPosition) -> GridPosition:
+        """The compressed position of the cell that holds a real position"""
+
+        row: int = bisect_right(self._row_starts, GridRow(position)) - 1
+        col: int = bisect_right(self._col_starts, GridCol(position)) - 1
+        if row < 0 or col < 0 or GridRow(position) >= self._row_starts[row] + self._row_weights[row] \
+                or GridCol(position) >= self._col_starts[col] + self._col_weights[col]:
+            raise IndexError(f'{position} is outside of the compressed grid')
+        return GridPosition(row, col)
+
+    def expand(self, cell: GridPosition) -> GridPosition:
+        """The first real position covered by a compressed cell"""
+        return GridPosition(self._row_starts[GridRow(cell)], self._col_starts[GridCol(cell)])
+
+    def weight(self, cell: GridPosition) -> int:
+        """The number of real positions covered by a compressed cell"""
+        return self._row_weights[GridRow(cell)] * self._col_weights[GridCol(cell)]
+
+    def at(self, position: GridPosition) -> Any:
+        """The value of the cell that holds a real position"""
+        return self[self.compress(position)]
+
+    def put(self, position: GridPosition, value: Any) -> None:
+        """Set the value of the cell that holds a real position"""
+        self[self.compress(position)] = value
+
+    def line(self, src: GridPosition, tgt: GridPosition, value: Any) -> None:
+        """Set every cell between two real positions in the same row or column, inclusive"""
+
+        first: GridPosition = self.compress(src)
+        last: GridPosition = self.compress(tgt)
+        if GridRow(first) != GridRow(last) and GridCol(first) != GridCol(last):
+            raise ValueError(f'{src} and {tgt} are not in the same row or column')
+
+        self._tables.clear()
+        for row in range(int(min(first.real, last.real)), int(max(first.real, last.real)) + 1):
+            for col in range(int(min(first.imag, last.imag)), int(max(first.imag, last.imag)) + 1):
+                self._grid[GridPosition(row, col)] = value
+        if isinstance(self, GridVariant):
+            self._reset()
+
+    def fill(self, start: GridPosition, value: Any) -> int:
+        """Flood fill the empty cells connected to a real position, returning the real area that was filled"""
+
+        self._tables.clear()
+        cells = self._grid
+        first: GridPosition = self.compress(start)
+        if first in cells:
+            return 0
+
+        area: int = 0
+        cells[first] = value
+        queue: deque[GridPosition] = deque([first])
+        while queue:
+            cell: GridPosition = queue.popleft()
+            area += self.weight(cell)
+            for direction in ORTHOGONAL:
+                neighbor: GridPosition = cell + direction
+                if neighbor not in cells and 0 <= neighbor.real < self._rows and 0 <= neighbor.imag < self._cols:
+                    cells[neighbor] = value
+                    queue.append(neighbor)
+        if isinstance(self, GridVariant):
+            self._reset()
+        return area
+
+    def table(self, predicate: Optional[Callable[[Any], bool]] = None) -> list[list[int]]:
+        """The summed-area table of the real area of the cells that match a predicate (or are stored), built once per predicate"""
+
+        if predicate not in self._tables:
+            table: list[list[int]] = [[0] * (self._cols + 1)]
+            for row, row_weight in enumerate(self._row_weights):
+                above: list[int] = table[-1]
+                sums: list[int] = [0]
+                running: int = 0
+                for col, col_weight in enumerate(self._col_weights):
+                    value: Any = self._grid.get(GridPosition(row, col), MISSING)
+                    if value is not MISSING and (predicate is None or predicate(value)):
+                        running += row_weight * col_weight
+                    sums.append(above[col + 1] + running)
+                table.append(sums)
+            self._tables[predicate] = table
+        return self._tables[predicate]
+
+    def area(self, src: GridPosition, tgt: GridPosition, predicate: Optional[Callable[[Any], bool]] = None) -> int:
+        """
+        The real area of the cells in the rectangle between two real corners that match a predicate (or are stored)
+
+        Whole cells are counted, so the corners should be among the points the grid was built from.
+        """
+
+        first: GridPosition = self.compress(src)
+        last: GridPosition = self.compress(tgt)
+        top, bottom = sorted((GridRow(first), GridRow(last)))
+        left, right = sorted((GridCol(first), GridCol(last)))
+
+        table: list[list[int]] = self.table(predicate)
+        return table[bottom + 1][right + 1] - table[top][right + 1] - table[bottom + 1][left] + table[top][left]
+
+
+class BitGrid:
+    """
+    Two-Dimensional grid of booleans (such as the occupied cells of a Grid) with each row stored as an int
+
+    Column c of a row is bit c of its int, so a whole row can be shifted, combined and counted in one operation.
+    """
+
+    def __init__(self, rows: int, cols: int, bits: Optional[list[int]] = None) -> None:
+        self.rows: int = rows
+        self.cols: int = cols
+        self.mask: int = (1 << cols) - 1
+        self.bits: list[int] = [0] * rows if bits is None else bits
+
+    @classmethod
+    def from_lines(cls, lines: list[str] | list[bytes], on: str = '#') -> BitGrid:
+        """Create a BitGrid from rows of characters, setting the cells that hold the on character"""
+
+        rows: list[str] = [line.decode('latin-1') if isinstance(line, (bytes, bytearray)) else line for line in lines]
+        table: dict[int, str] = {code: '0' for code in map(ord, set().union(*rows))}
+        table[ord(on)] = '1'
+        return cls(len(rows), max(map(len, rows), default=0), [int(row.translate(table)[::-1] or '0', 2) for row in rows])
+
+    @classmethod
+    def from_grid(cls, grid: Grid, predicate: Optional[Callable[[Any], bool]] = None) -> BitGrid:
+        """Create a BitGrid with the stored cells of a Grid (that match a predicate) set"""
+
+        bits: BitGrid = cls(grid.row_range.stop, grid.col_range.stop)
+        for position in (grid.keys() if predicate is None else grid.where(predicate)):
+            bits.add(position)
+        return bits
+
+    def to_grid(self, value: Any = 1, **keywords) -> Grid:
+        """Create a sparse Grid holding the value at every set cell"""
+        keywords.setdefault('sparse', True)
+        return Grid.from_points(self, value, rows=self.rows, cols=self.cols, **keywords)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.rows}, {self.cols})'
+
+    def __str__(self) -> str:
+        return f'{self.__class__.__name__}({self.rows}x{self.cols} => {len(self)})'
+
+    @property
+    def lines(self) -> list[str]:
+        return [format(row, f'0{self.cols}b')[::-1].replace('0', '.').replace('1', '#') if self.cols else '' for row in self.bits]
+
+    @property
+    def printable(self) -> str:
+        return '\n'.join(f'{r:3d}: {line}' for r, line in enumerate(self.lines))
+
+    def __contains__(self, position: GridPosition) -> bool:
+        row, col = GridRow(position), GridCol(position)
+        return 0 <= row < self.rows and 0 <= col < self.cols and bool(self.bits[row] >> col & 1)
+
+    def add(self, position: GridPosition) -> None:
+        row, col = GridRow(position), GridCol(position)
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            raise IndexError(f'{position} is outside of the bit grid')
+        self.bits[row] |= 1 << col
+
+    def discard(self, position: GridPosition) -> None:
+        row, col = GridRow(position), GridCol(position)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            self.bits[row] &= ~(1 << col)
+
+    def __iter__(self) -> Iterator[GridPosition]:
+        for row, bits in enumerate(self.bits):
+            while bits:
+                low: int = bits & -bits
+                yield GridPosition(row, low.bit_length() - 1)
+                bits ^= low
+
+    def __len__(self) -> int:
+        return sum(row.bit_count() for row in self.bits)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BitGrid) and (self.rows, self.cols, self.bits) == (other.rows, other.cols, other.bits)
+
+    def __or__(self, other: BitGrid) -> BitGrid:
+        return BitGrid(self.rows, self.cols, [a | b for a, b in zip(self.bits, other.bits)])
+
+    def __and__(self, other: BitGrid) -> BitGrid:
+        return BitGrid(self.rows, self.cols, [a & b for a, b in zip(self.bits, other.bits)])
+
+    def __sub__(self, other: BitGrid) -> BitGrid:
+        return BitGrid(self.rows, self.cols, [a & ~b for a, b in zip(self.bits, other.bits)])
+
+    def __xor__(self, other: BitGrid) -> BitGrid:
+        return BitGrid(self.rows, self.cols, [a ^ b for a, b in zip(self.bits, other.bits)])
+
+    def __invert__(self) -> BitGrid:
+        return BitGrid(self.rows, self.cols, [~row & self.mask for row in self.bits])
+
+    def shift_row(self, row: int, cols: int) -> int:
+        """One row moved cols columns to the east (or west, if negative), dropping bits that fall off the edge"""
+        bits: int = self.bits[row] if 0 <= row < self.rows else 0
+        return (bits << cols) & self.mask if cols >= 0 else bits >> -cols
+
+    def shift(self, direction: GridDirection) -> BitGrid:
+        """Move every set cell one step (or more) in a direction, dropping those that fall off the edge"""
+        rows, cols = GridRow(direction), GridCol(direction)
+        return BitGrid(self.rows, self.cols, [self.shift_row(row - rows, cols) for row in range(self.rows)])
+
+    def neighbors(self, direction: GridDirection) -> BitGrid:
+        """The cells whose neighbor in a direction is set"""
+        return self.shift(-direction)
+
+    def count_planes(self, kernel: Iterable[GridDirection] = ADJACENT) -> list[BitGrid]:
+        """Count the set neighbors of every cell bit-parallel, returning the binary digits of the counts as BitGrids"""
+
+        directions: list[GridDirection] = list(kernel)
+        planes: list[list[int]] = []
+        for row in range(self.rows):
+            digits: list[int] = []
+            for direction in directions:
+                carry: int = self.shift_row(row + GridRow(direction), -GridCol(direction))
+                for index, digit in enumerate(digits):
+                    digits[index], carry = digit ^ carry, digit & carry
+                if carry:
+                    digits.append(carry)
+            for index, digit in enumerate(digits):
+                if index == len(planes):
+                    planes.append([0] * self.rows)
+                planes[index][row] = digit
+        return [BitGrid(self.rows, self.cols, plane) for plane in planes]
+
+    def fewer_than(self, count: int, kernel: Iterable[GridDirection] = ADJACENT) -> BitGrid:
+        """The cells (set or not) with fewer than count set neighbors"""
+
+        planes: list[BitGrid] = self.count_planes(kernel)
+        width: int = max(len(planes), count.bit_length())
+        less: list[int] = [0] * self.rows
+        equal: list[int] = [self.mask] * self.rows
+        for index in reversed(range(width)):
+            plane: list[int] = planes[index].bits if index < len(planes) else [0] * self.rows
+            for row in range(self.rows):
+                if count >> index & 1:
+                    less[row] |= equal[row] & ~plane[row]
+                    equal[row] &= plane[row]
+                else:
+                    equal[row] &= ~plane[row]
+        return BitGrid(self.rows, self.cols, less)
+
+
+@dataclass
+class GridStats:
+    """Operation counts recorded by an InstrumentedGrid"""
+
+    get: int = 0
+    set: int = 0
+    delete: int = 0
+    hits: int = 0
+    misses: int = 0
+    expansions: int = 0
+    sites: Optional[Counter[tuple[str, str]]] = None
+
+    def record(self, operation: str) -> None:
+        """Count an operation against the line that called the Grid"""
+        if self.sites is not None:
+            caller: FrameType = sys._getframe(2)
+            self.sites[(operation, f'{os.path.basename(caller.f_code.co_filename)}:{caller.f_lineno}')] += 1
+
+
+class GridVariant(Grid):
+    """Base class for behaviors that are chosen with a keyword when a Grid (or a Grid subclass) is constructed"""
+
+    keyword: str = ''
+
+    def __reduce__(self) -> tuple:
+        base: type = next(cls for cls in self.__class__.__mro__ if not issubclass(cls, GridVariant))
+        return variant_grid, (base, variants(self.__class__)), self.__dict__
+
+    def _reset(self) -> None:
+        """Rebuild this variant's state, after the grid's cells have been replaced"""
+
+
+class InstrumentedGrid(GridVariant):
+    """A Grid that counts its operations, hits and misses against the default, and boundary expansions"""
+
+    keyword: str = 'instrument'
+
+    def __init__(self, *args, **keywords) -> None:
+        self.stats: GridStats = GridStats(sites=Counter() if keywords.get('call_sites', False) else None)
+        super().__init__(*args, **keywords)
+
+    def _reset(self) -> None:
+        # The counts describe the operations made on the grid, so they survive its cells being replaced;
+        # only a grid that was loaded, rather than constructed, needs them created
+        if 'stats' not in self.__dict__:
+            self.stats = GridStats()
+        super()._reset()
+
+    def snapshot(self) -> Grid:
+        clone: InstrumentedGrid = super().snapshot()  # type: ignore
+        clone.stats = replace(self.stats, sites=None if self.stats.sites is None else self.stats.sites.copy())
+        return clone
+
+    def __getitem__(self, key: GridPosition | tuple[int, int]) -> Any:
+        self.stats.get += 1
+        self.stats.record('get')
+        if (GridPosition(*key) if isinstance(key, tuple) else key) in self._grid:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: GridPosition | tuple[int, int], value: Any) -> None:
+        self.stats.set += 1
+        self.stats.record('set')
+        if self._dynamic:
+            position: GridPosition = GridPosition(*key) if isinstance(key, tuple) else key
+            if not (self._min_row <= GridRow(position) <= self._max_row and self._min_col <= GridCol(position) <= self._max_col):
+                self.stats.expansions += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key: GridPosition | tuple[int, int]) -> None:
+        self.stats.delete += 1
+        self.stats.record('del')
+        super().__delitem__(key)
+
+    @property
+    def operations(self) -> Mapping:
+        stats: GridStats = self.stats
+        return {'set': stats.set, 'get': stats.get, 'del': stats.delete,
+                'hits': stats.hits, 'misses': stats.misses, 'expansions': stats.expansions}
+
+    def hotspots(self, top: int = 10) -> list[tuple[tuple[str, str], int]]:
+        """The call sites that made the most operations, if call sites are being counted"""
+        return self.stats.sites.most_common(top) if self.stats.sites is not None else []
+
+
+class IndexedGrid(GridVariant):
+    """A Grid that keeps an index of the positions holding each value, so that finding and counting values is O(1)"""
+
+    keyword: str = 'index'
+
+    def __init__(self, *args, **keywords) -> None:
+        self._index: dict[Any, dict[GridPosition, None]] = {}
+        # A snapshot shares the index of the grid it was taken from, keeping its own changes to it here
+        self._added: Optional[dict[Any, dict[GridPosition, None]]] = None
+        self._removed: Optional[dict[Any, set[GridPosition]]] = None
+        super().__init__(*args, **keywords)
+        self.reindex()
+
+    def _reset(self) -> None:
+        self.reindex()
+        super()._reset()
+
+    def reindex(self) -> None:
+        """Rebuild the index from the cells, such as after they were changed without going through the Grid"""
+
+        self._index = {}
+        self._added = self._removed = None
+        for position, value in self._grid.items():
+            self._index.setdefault(value, {})[position] = None
+
+    def snapshot(self) -> Grid:
+        clone: IndexedGrid = super().snapshot()  # type: ignore
+        # A snapshot of a snapshot starts from (and rolls back to) a copy of its changes to the shared index
+        clone._baseline = (self._added or {}, self._removed or {})
+        clone._added, clone._removed = self._changes(clone._baseline)
+        return clone
+
+    @staticmethod
+    def _changes(baseline: tuple[dict, dict]) -> tuple[dict, dict]:
+        added, removed = baseline
+        return {value: positions.copy() for value, positions in added.items()}, {value: positions.copy() for value, positions in removed.items()}
+
+    def rollback(self) -> None:
+        super().rollback()
+        if self._removed is None:
+            self.reindex()  # the snapshot was cleared, replacing the shared index
+        else:
+            self._added, self._removed = self._changes(self._baseline)
+
+    def _include(self, position: GridPosition, value: Any) -> None:
+        if self._added is None or self._removed is None:
+            self._index.setdefault(value, {})[position] = None
+        elif position in self._removed.get(value, ()):
+            self._removed[value].discard(position)
+        else:
+            self._added.setdefault(value, {})[position] = None
+
+    def _unindex(self, position: GridPosition, value: Any) -> None:
+        if self._added is None or self._removed is None:
+            positions: dict[GridPosition, None] = self._index[value]
+            del positions[position]
+            if not positions:
+                del self._index[value]
+        elif position in self._added.get(value, ()):
+            del self._added[value][position]
+        else:
+            self._removed.setdefault(value, set()).add(position)
+
+    def __setitem__(self, key: GridPosition | tuple[int, int], value: Any) -> None:
+        position: GridPosition = GridPosition(*key) if isinstance(key, tuple) else key
+        old: Any = self._grid.get(position, MISSING)
+        super().__setitem__(key, value)
+        if old is not MISSING:
+            self._unindex(position, old)
+        new: Any = self._grid.get(position, MISSING)
+        if new is not MISSING:
+            self._include(position, new)
+
+    def __delitem__(self, key: GridPosition | tuple[int, int]) -> None:
+        position: GridPosition = GridPosition(*key) if isinstance(key, tuple) else key
+        old: Any = self._grid.get(position, MISSING)
+        super().__delitem__(key)
+        if old is not MISSING:
+            self._unindex(position, old)
+
+    def clear(self) -> None:
+        super().clear()
+        # Replace the index rather than clearing it, as a snapshot shares it
+        self._index = {}
+        self._added = self._removed = None
+
+    def find(self, value) -> list[GridPosition]:
+        return list(self.positions(value))
+
+    def count(self, value: Any) -> int:
+        if self._added is None or self._removed is None:
+            return len(self._index.get(value, ()))
+        return len(self._index.get(value, ())) - len(self._removed.get(value, ())) + len(self._added.get(value, ()))
+
+    def positions(self, value: Any) -> Iterator[GridPosition]:
+        if self._added is None or self._removed is None:
+            return iter(self._index.get(value, ()))
+        removed: set[GridPosition] = self._removed.get(value, set())
+        return chain((p for p in self._index.get(value, ()) if p not in removed), self._added.get(value, ()))
+
+    @property
+    def indexed(self) -> KeysView[Any]:
+        """The distinct values in the grid"""
+        if self._added is None or self._removed is None:
+            return self._index.keys()
+        return dict.fromkeys(value for value in chain(self._index, self._added) if self.count(value)).keys()
+
+
+VARIANTS: list[type[GridVariant]] = [InstrumentedGrid, IndexedGrid]
+
+
+@cache
+def variant(cls: type[Grid], chosen: tuple[type[GridVariant], ...]) -> type[Grid]:
+    """The variant of a Grid class (such as a puzzle's Grid subclass) with some extra behaviors"""
+
+    chosen = tuple(behavior for behavior in chosen if not issubclass(cls, behavior))
+    if not chosen:
+        return cls
+    if cls is Grid and len(chosen) == 1:
+        return chosen[0]
+    name: str = ''.join(behavior.__name__.removesuffix('Grid') for behavior in chosen) + cls.__name__
+    return type(name, (*chosen, cls), {})
+
+
+def variants(cls: type[Grid]) -> tuple[type[GridVariant], ...]:
+    """The behaviors of a Grid variant class"""
+    return tuple(behavior for behavior in VARIANTS if issubclass(cls, behavior))
+
+
+def variant_grid(cls: type[Grid], chosen: tuple[type[GridVariant], ...]) -> Grid:
+    """Create an empty grid variant, for unpickling"""
+    return cast(Grid, object.__new__(variant(cls, chosen)))
+
+
 __all__: list[str] = [
+    "ADJACENT",
+    "ArrayStorage",
+    "BitGrid",
+    "ByteStorage",
+    "CompressedGrid",
+    "DenseStorage",
     "Grid",
     "GridCol",
     "GridDirection",
@@ -318,6 +1688,15 @@ __all__: list[str] = [
     "GridArea",
     "GridPosition",
     "GridRow",
+    "GridStats",
+    "GridVariant",
+    "GridView",
+    "GridWindow",
+    "IndexedGrid",
+    "InstrumentedGrid",
+    "NumpyStorage",
+    "OverlayStorage",
+    "ORTHOGONAL",
     "NORTH",
     "SOUTH",
     "EAST",
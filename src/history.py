@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from argparse import ArgumentParser, Namespace
+from collections import defaultdict
+from functools import cache
+from statistics import median
+from typing import Any, Iterable, Iterator
+
+HISTORY_FILE: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'history.jsonl')
+THRESHOLD: float = 10.0  # percent
+
+Key = tuple[str, str, str, str]
+
+
+@cache
+def revision(directory: str) -> str:
+    """The git revision of the working tree containing directory, marked if there are uncommitted changes"""
+
+    def git(*args: str) -> str:
+        return subprocess.run(['git', *args], cwd=directory or '.', capture_output=True, text=True, check=True).stdout.strip()
+
+    try:
+        commit: str = git('rev-parse', '--short', 'HEAD')
+        dirty: bool = bool(git('status', '--porcelain', '--untracked-files=no'))
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return f'{commit}-dirty' if dirty else commit
+
+
+def append(path: str, records: Iterable[dict[str, Any]]) -> None:
+    """Append records to a history file, one JSON object per line"""
+
+    with open(path, 'a') as hf:
+        for record in records:
+            hf.write(json.dumps(record, default=str) + '\n')
+
+
+def load(path: str) -> Iterator[dict[str, Any]]:
+    """Read every record from a history file, skipping lines that can't be parsed"""
+
+    try:
+        with open(path) as hf:
+            for line in hf:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return
+
+
+def record(day: str, timing: Any, directory: str, mode: dict[str, Any]) -> dict[str, Any]:
+    """Describe one timed phase of a puzzle run as a history record"""
+
+    return {
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'revision': revision(directory),
+        'python': platform.python_version(),
+        'day': day,
+        'part': timing.phase,
+        'dataset': timing.dataset,
+        'result': timing.result if timing.phase != 'parse' else None,
+        'elapsed': timing.elapsed,
+        'samples': timing.samples,
+        'memory': timing.memory,
+        'mode': mode,
+    }
+
+
+def setting(rec: dict[str, Any]) -> str:
+    """Describe how a record was timed (Python version, profiling, memory tracing, concurrency), as only like can be compared"""
+
+    mode: dict[str, Any] = rec.get('mode') or {}
+    flags: list[str] = [name for name in ('profile', 'memory', 'concurrent') if mode.get(name)]
+    return '+'.join([f'py{rec.get("python", "?")}', *flags])
+
+
+def medians(records: Iterable[dict[str, Any]], rev: str) -> dict[Key, float]:
+    """Find the median time for every (day, part, dataset, setting) recorded for a revision"""
+
+    times: dict[Key, list[float]] = defaultdict(list)
+    for rec in records:
+        if rec.get('revision') == rev:
+            times[(rec['day'], rec['part'], rec['dataset'], setting(rec))].extend(rec.get('samples') or [rec['elapsed']])
+    return {key: median(values) for key, values in times.items()}
+
+
+def revisions(records: Iterable[dict[str, Any]]) -> list[str]:
+    """List the revisions in a history, in the order they first appear"""
+    return list(dict.fromkeys(rec.get('revision', 'unknown') for rec in records))
+
+
+def compare(path: str, baseline: str | None, current: str | None, threshold: float) -> list[Key]:
+    """Print the median times for two revisions, returning the parts that regressed past the threshold"""
+
+    records: list[dict[str, Any]] = list(load(path))
+    known: list[str] = revisions(records)
+    if not known:
+        print(f'No history in {path}')
+        return []
+
+    current = current or known[-1]
+    if baseline is None:
+        earlier: list[str] = known[:known.index(current)] if current in known else []
+        if not earlier:
+            print(f'No revision before {current} to compare with')
+            return []
+        baseline = earlier[-1]
+
+    before: dict[Key, float] = medians(records, baseline)
+    after: dict[Key, float] = medians(records, current)
+
+    print(f'===== {baseline} => {current} (threshold {threshold:g}%) =====')
+    regressions: list[Key] = []
+    for key in sorted(before.keys() & after.keys()):
+        change: float = (after[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+        regressed: bool = change > threshold
+        if regressed:
+            regressions.append(key)
+        flag: str = 'REGRESSED' if regressed else ''
+        print(f'{" ".join(key):48s}{before[key]:13,.3f} ms{after[key]:13,.3f} ms{change:+9.1f}% {flag}')
+
+    print(f'{len(regressions)} regression(s)')
+    return regressions
+
+
+def options(arguments: list[str]) -> Namespace:
+    parser = ArgumentParser(description='Compare puzzle timings between revisions recorded in the history file')
+    parser.add_argument('--file', default=HISTORY_FILE, help='history file')
+    parser.add_argument('--baseline', help='revision to compare against (defaults to the one before current)')
+    parser.add_argument('--current', help='revision to check (defaults to the latest recorded)')
+    parser.add_argument('--threshold', type=float, default=THRESHOLD, help='percent slowdown that counts as a regression')
+    parser.add_argument('--list', action='store_true', help='list the recorded revisions')
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str]) -> int:
+    args: Namespace = options(arguments)
+
+    if args.list:
+        print('\n'.join(revisions(load(args.file))))
+        return 0
+
+    return 1 if compare(args.file, args.baseline, args.current, args.threshold) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
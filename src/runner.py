@@ -1,24 +1,159 @@
 from __future__ import annotations
 
+import _thread
+import cProfile
+import glob
+import hashlib
+import mmap
+import multiprocessing
 import os
+import pickle
+import pstats
+import signal
 import sys
+import threading
 import time
-
+import tracemalloc
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from copy import deepcopy
+from dataclasses import dataclass, field
+from functools import cached_property, partial
+from inspect import getfile
 from math import isnan, nan
-from typing import Any, Optional, IO, Callable
+from statistics import median, quantiles, stdev
+from typing import Any, Optional, IO, Callable, Iterator
+
+import history
+import search
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
 
 IGNORE: float = nan
 
+CACHE_EXTENSION: str = '.cache'
+CACHE_LIMIT: int = 256  # megabytes
+PARSER_MODULES: list[str] = ['common', 'grid', 'runner', 'search']
+
+MMAP_THRESHOLD: int = 64 * 1024 * 1024
+STREAM_CHUNK: int = 1024 * 1024
+
+PROFILE_TOP: int = 10
+
+WATCHDOG_INTERVAL: float = 0.01  # seconds
+RSS_UNITS: int = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+
 Data = list | Any
 PuzzleResult = int | dict | list
 
 
+@dataclass
+class Timing:
+    """Elapsed time (in milliseconds) for one phase of a puzzle run"""
+
+    phase: str
+    dataset: str
+    elapsed: float
+    result: Any = None
+    samples: list[float] = field(default_factory=list)
+    memory: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def statistics(self) -> dict[str, float]:
+        """Summarize the benchmark samples (in milliseconds)"""
+        samples: list[float] = self.samples or [self.elapsed]
+        return {
+            'min': min(samples),
+            'median': median(samples),
+            'p95': quantiles(samples, n=20, method='inclusive')[-1] if len(samples) > 1 else samples[0],
+            'stdev': stdev(samples) if len(samples) > 1 else 0.0,
+        }
+
+
+class Stream:
+    """A data file that is read again, one record at a time, every time it is iterated
+
+    Use it for data that is processed in a single pass, so that the whole file
+    never needs to fit in memory.
+    """
+
+    def __init__(self, reader: Callable[..., Iterator], *args: Any) -> None:
+        self.reader: Callable[..., Iterator] = reader
+        self.args: tuple = args
+
+    def __iter__(self) -> Iterator:
+        return iter(self.reader(*self.args))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}{self.args}'
+
+    def __copy__(self) -> Stream:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Stream:
+        return self
+
+
+class Status(str):
+    """The outcome of a part that was stopped before it produced a result"""
+
+
+TIMEOUT: Status = Status('TIMEOUT')
+OOM: Status = Status('OOM')
+CRASHED: Status = Status('CRASHED')
+
+
+class MemoryWatchdog(threading.Thread):
+    """Interrupt the main thread when traced memory grows past a limit (in bytes)"""
+
+    def __init__(self, limit: int) -> None:
+        super().__init__(name='memory-watchdog', daemon=True)
+        self.limit: int = limit
+        self.tripped: bool = False
+        self.finished = threading.Event()
+
+    def run(self) -> None:
+        while not self.finished.wait(WATCHDOG_INTERVAL):
+            if tracemalloc.get_traced_memory()[0] > self.limit:
+                self.tripped = True
+                _thread.interrupt_main()
+                return
+
+    def stop(self) -> bool:
+        """Stop watching, returning True if the limit was exceeded"""
+        self.finished.set()
+        self.join()
+        return self.tripped
+
+
+def max_rss() -> int:
+    """The peak resident set size of this process, in bytes"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * RSS_UNITS if resource else 0
+
+
+def fresh_copy(value: Any) -> Any:
+    """A private copy of some data for one run: a snapshot, if the data can take one, otherwise a deep copy"""
+    snapshot: Optional[Callable] = getattr(value, 'snapshot', None)
+    return snapshot() if callable(snapshot) else deepcopy(value)
+
+
+PUZZLES: dict[str, Puzzle] = {}
+
+
 class Puzzle:
     """This is a framework for solving each day's puzzle"""
 
     def __init__(self, datafile: str = 'real.data', *testfiles: str) -> None:
-        self.base: str = os.path.dirname(sys.argv[0])
+        try:
+            self.base: str = os.path.dirname(getfile(self.__class__))
+        except (OSError, TypeError):
+            self.base = os.path.dirname(sys.argv[0])
 
+        self.realfile: str = datafile
         self.datafile: str = datafile
         self.testfiles: tuple[str, ...] = testfiles or ('test.data',)
         self.currentfile = ''
@@ -26,10 +161,42 @@ class Puzzle:
         self.data: Data = None
         self.tests: list[Data] = []
 
+        self.expected: tuple[Optional[PuzzleResult], Optional[PuzzleResult]] = (None, None)
+        self.keywords: dict[str, Any] = {}
+        self.timings: list[Timing] = []
+
+        self.testonly: bool = False
+        self.cache_limit: int = 0
+        self.repeat: int = 0
+        self.warmup: int = 0
+        self.workers: int = 0
+        self.profile: int = 0
+        self.profile_memory: bool = False
+        self.memory: bool = False
+        self.memory_limit: int = 0
+        self.history: str = ''
+        self.time_budget: float = 0
+        self.memory_budget: int = 0
+        self.search_stats: bool = False
+
+        self._futures: dict[tuple[str, Optional[int]], Future] = {}
+        self._profiles: dict[tuple[str, str], list[str]] = {}
+        self._memory: dict[str, int] = {}
+        self._searches: Optional[search.SearchStats] = None
+        self._baseline: tuple[int, int, int] = (0, 0, 0)
+        self._watchdog: Optional[MemoryWatchdog] = None
+
         self._started = 0
         self._elapsed = 0
         self._overall = 0
 
+    def __getstate__(self) -> dict[str, Any]:
+        # Worker processes are sent their own data, so don't send everything else along with the puzzle
+        state: dict[str, Any] = self.__dict__.copy()
+        for name in ['data', 'tests', 'timings', '_futures', '_profiles', '_watchdog']:
+            state.pop(name, None)
+        return state
+
     def __repr__(self) -> str:
         text: str = self.__class__.__name__.replace('Day', 'Day ')
         return f'{text}: {self.__doc__}' if self.__doc__ else text
@@ -110,6 +277,53 @@ class Puzzle:
         with self.open(filename, 'rb') as df:
             return df.read().strip().split(sep)
 
+    # ----- Streaming readers for large data files ----------------------------
+
+    def iter_lines(self, filename: str) -> Iterator[str]:
+        """Read a data file one line at a time, memory mapping large files"""
+
+        path: str = os.path.join(self.base, filename)
+        size: int = os.path.getsize(path)
+
+        if size < MMAP_THRESHOLD:
+            with self.open(filename) as df:
+                yield from df
+            return
+
+        with open(path, 'rb') as df, mmap.mmap(df.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                yield line.decode()
+
+    def iter_stripped(self, filename: str) -> Iterator[str]:
+        """Read a data file one line at a time, stripping leading and trailing white space"""
+
+        return map(str.strip, self.iter_lines(filename))
+
+    def iter_split(self, filename: str, sep: str) -> Iterator[str]:
+        """Read a data file one record at a time, splitting on a seperator (yielding the same records as read_split)"""
+
+        buffer: Optional[str] = None
+        with self.open(filename) as df:
+            for chunk in iter(partial(df.read, STREAM_CHUNK), ''):
+                buffer = (chunk.lstrip() or None) if buffer is None else buffer + chunk
+                if buffer is None:
+                    continue
+                # Hold back trailing white space, which read_split strips if it ends the file
+                content: str = buffer.rstrip()
+                *records, last = content.split(sep)
+                buffer = last + buffer[len(content):]
+                yield from records
+        yield '' if buffer is None else buffer.rstrip()
+
+    def iter_factory(self, filename: str, factory: Callable) -> Iterator:
+        """Read a data file one stripped line at a time, yielding objects created by the factory"""
+        method: Callable = self.get_factory_method(factory)
+        return map(method, self.iter_stripped(filename))
+
+    def read_factory_stream(self, filename: str, factory: Callable) -> Stream:
+        """Return a Stream of objects created by the factory, which re-reads the data file on each pass"""
+        return Stream(self.iter_factory, filename, factory)
+
     def data_path(self, filename: str, extension: str) -> str:
         name: str = filename.replace('.data', extension)
         path: str = os.path.join(self.base, name)
@@ -118,14 +332,95 @@ class Puzzle:
     def current_path(self, extension: str = '.out') -> str:
         return self.data_path(self.currentfile, extension)
 
+    # ----- Parse cache -------------------------------------------------------
+
+    @cached_property
+    def parser_digest(self) -> bytes:
+        """Hash the source of the puzzle module and the modules its parser relies upon"""
+
+        digest = hashlib.sha256(self.__class__.__module__.encode())
+        for name in [self.__class__.__module__, *PARSER_MODULES]:
+            filename: Optional[str] = getattr(sys.modules.get(name), '__file__', None)
+            if filename:
+                with open(filename, 'rb') as source:
+                    digest.update(source.read())
+        return digest.digest()
+
+    def cache_path(self, filename: str) -> str:
+        """Name the cache file for a data file, keyed by the data file's contents and the parser source"""
+
+        digest = hashlib.sha256(self.parser_digest)
+        with self.open(filename, 'rb') as df:
+            digest.update(df.read())
+        return os.path.join(self.base, f'{filename}.{digest.hexdigest()[:16]}{CACHE_EXTENSION}')
+
+    def cached_parse(self, filename: str) -> Data:
+        """Parse a data file, reusing the pickled result of an earlier parse when nothing has changed"""
+
+        path: str = self.cache_path(filename)
+        try:
+            with open(path, 'rb') as cf:
+                data: Data = pickle.load(cf)
+            os.utime(path)
+            return data
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            os.remove(path)
+
+        data = self.parse_data(filename)
+
+        try:
+            payload: bytes = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            print(f'             : unable to cache {filename}: {e}')
+            return data
+
+        for stale in glob.glob(os.path.join(self.base, f'{glob.escape(filename)}.*{CACHE_EXTENSION}')):
+            os.remove(stale)
+        with open(path, 'wb') as cf:
+            cf.write(payload)
+        self.evict_cache()
+
+        return data
+
+    def evict_cache(self) -> None:
+        """Remove the least recently used cache files until the cache fits within its limit"""
+
+        paths: list[str] = glob.glob(os.path.join(self.base, f'*{CACHE_EXTENSION}'))
+        paths.sort(key=os.path.getmtime, reverse=True)
+
+        total: int = 0
+        for path in paths:
+            total += os.path.getsize(path)
+            if total > self.cache_limit * 1024 * 1024:
+                os.remove(path)
+
     # ----- Test runner -------------------------------------------------------
 
+    @property
+    def day(self) -> str:
+        return os.path.basename(self.base)
+
+    def register(self,
+                 test1: Optional[PuzzleResult] = None,
+                 test2: Optional[PuzzleResult] = None,
+                 **keywords) -> Puzzle:
+        """Record the expected test results, making this puzzle available to the suite runner"""
+
+        self.expected = (test1, test2)
+        self.keywords = keywords
+        PUZZLES[self.day] = self
+        return self
+
     @staticmethod
     def data_length(data: Any) -> int:
         return 1 if not hasattr(data, '__len__') else len(data)
 
     def create_data(self, type: str, filename: str) -> Data:
-        data: Data = self.parse_data(filename)
+        self.currentfile = filename
+        parser: Callable = self.cached_parse if self.cache_limit else self.parse_data
+        data: Data = self.profiled('parse', parser, filename)
         if not isinstance(data, list) and not isinstance(data, str):
             setattr(data, 'datatype', type)
         return data
@@ -136,62 +431,170 @@ class Puzzle:
             **keywords) -> None:
         """Load data and run tests"""
 
+        if test1 is None and test2 is None:
+            test1, test2 = self.expected
+        keywords = {**self.keywords, **keywords}
+
         print(f'===== {self} =====')
 
-        self.testonly: bool = keywords.get('testonly', False)
+        self._overall = 0
+        self.timings = []
+        started: int = time.perf_counter_ns()
+
+        self.testonly = keywords.get('testonly', False)
+        self.datafile = keywords.get('datafile') or os.environ.get('AOC_DATA') or self.realfile
+        caching: bool = bool(keywords.get('cache', os.environ.get('AOC_CACHE', '')))
+        self.cache_limit = int(keywords.get('cache_limit', os.environ.get('AOC_CACHE_LIMIT', CACHE_LIMIT))) if caching else 0
+        self.repeat = int(keywords.get('benchmark', os.environ.get('AOC_BENCHMARK', 0)))
+        self.warmup = int(keywords.get('warmup', os.environ.get('AOC_WARMUP', 1 if self.repeat else 0)))
+        self.workers = self.count_setting(keywords.get('concurrent', os.environ.get('AOC_CONCURRENT', 0)), os.cpu_count() or 1)
+        self.profile = self.count_setting(keywords.get('profile', os.environ.get('AOC_PROFILE', 0)), PROFILE_TOP)
+        self.profile_memory = bool(keywords.get('profile_memory', os.environ.get('AOC_PROFILE_MEMORY', ''))) and bool(self.profile)
+        self.memory_limit = int(keywords.get('memory_limit', os.environ.get('AOC_MEMORY_LIMIT', 0)))
+        self.memory = bool(keywords.get('memory', os.environ.get('AOC_MEMORY', ''))) or bool(self.memory_limit)
+        self.time_budget = float(keywords.get('time_budget', os.environ.get('AOC_TIME_BUDGET', 0)))
+        self.memory_budget = int(keywords.get('memory_budget', os.environ.get('AOC_MEMORY_BUDGET', 0)))
+        self.search_stats = bool(keywords.get('search_stats', os.environ.get('AOC_SEARCH_STATS', '')))
+        setting: Any = keywords.get('history', os.environ.get('AOC_HISTORY', ''))
+        self.history = history.HISTORY_FILE if setting is True or str(setting).lower() in ('1', 'true', 'yes', 'on') else str(setting or '')
+
+        tracing: bool = self.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
 
         try:
             if self.check_data_files():
                 return
 
-            self.start()
-            self.tests: list[Data] = [self.create_data('test', tf) for tf in self.testfiles]
-            self.stop()
-            print(f'{self.elapsed_}: parsed test data {[self.data_length(t) for t in self.tests]}')
+            self.tests: list[Data] = self.parse('test', self.testfiles)
+            self.report(f'parsed test data {[self.data_length(t) for t in self.tests]}')
 
             if not self.testonly:
-                self.start()
-                self.data = self.create_data('real', self.datafile)
-                self.stop()
-                print(f'{self.elapsed_}: parsed real data [{self.data_length(self.data)}]')
+                self.data = self.parse('real', [self.datafile])[0]
+                self.report(f'parsed real data [{self.data_length(self.data)}]')
 
             skip: bool = keywords.get('skip', False)
 
+            checks: list[tuple[str, PuzzleResult]] = []
             if test1 is not None and not skip:
-                try:
-                    if isinstance(test1, dict):
-                        self.map_test('part1', **test1)
-                    elif isinstance(test1, list):
-                        if len(self.tests) == len(test1):
-                            self.multi_test('part1', test1, self.tests, True)
-                        else:
-                            self.multi_test(
-                                'part1', test1, self.tests[0], False)
-                    else:
-                        self.single_test('part1', test1)
-                except AssertionError as e:
-                    print(f'part 1 failed: {" ".join(e.args)}')
-
+                checks.append(('part1', test1))
             if test2 is not None:
-                try:
-                    if isinstance(test2, dict):
-                        self.map_test('part2', **test2)
-                    elif isinstance(test2, list):
-                        if len(self.tests) == len(test2):
-                            self.multi_test('part2', test2, self.tests, True)
-                        else:
-                            self.multi_test(
-                                'part2', test2, self.tests[0], False)
-                    else:
-                        self.single_test('part2', test2)
-                except AssertionError as e:
-                    print(f'part 2 failed: {" ".join(e.args)}')
+                checks.append(('part2', test2))
+
+            with self.concurrently(checks):
+                for name, expected in checks:
+                    try:
+                        self.check(name, expected)
+                    except AssertionError as e:
+                        print(f'part {name[-1]} failed: {" ".join(e.args)}')
+                    except MemoryError as e:
+                        print(f'part {name[-1]} aborted: {" ".join(map(str, e.args))}')
 
             print(f'{self.overall_}: total')
+            if self.concurrent:
+                print(f'{(time.perf_counter_ns() - started) / 1_000_000:10,.3f} ms: wall clock ({self.workers} workers)')
+
+            if self.history:
+                self.save_history()
 
         except NotImplementedError as e:
             print(f'{self.__class__.__name__}: {" ".join(e.args)} not implemented.')
 
+        except MemoryError as e:
+            print(f'{self.__class__.__name__}: parsing aborted: {" ".join(map(str, e.args))}')
+
+        finally:
+            if tracing:
+                tracemalloc.stop()
+
+    def save_history(self) -> None:
+        """Append a record of every timed phase of this run to the history file"""
+
+        mode: dict[str, Any] = {
+            'benchmark': self.repeat,
+            'concurrent': self.workers if self.concurrent else 0,
+            'profile': bool(self.profile),
+            'memory': self.memory,
+        }
+        history.append(self.history, [history.record(self.day, timing, self.base, mode) for timing in self.timings])
+
+    @property
+    def concurrent(self) -> bool:
+        """Part runs are sent to worker processes, unless benchmarking, profiling, counting searches or isolating them"""
+        return bool(self.workers) and not self.repeat and not self.profile and not self.search_stats and not self.isolated
+
+    @property
+    def isolated(self) -> bool:
+        """Each part run gets its own child process, which is killed if it exceeds its budget"""
+        return bool(self.time_budget or self.memory_budget)
+
+    def check(self, name: str, expected: PuzzleResult) -> None:
+        """Run part1 or part2 using the test runner that matches the expectations"""
+
+        if isinstance(expected, dict):
+            self.map_test(name, **expected)
+        elif isinstance(expected, list):
+            if len(self.tests) == len(expected):
+                self.multi_test(name, expected, self.tests, True)
+            else:
+                self.multi_test(name, expected, self.tests[0], False)
+        else:
+            self.single_test(name, expected)
+
+    def jobs(self, name: str, expected: PuzzleResult) -> list[tuple[Optional[int], Data, tuple]]:
+        """List the (test index, data, extra arguments) runs that check() will make for part1 or part2"""
+
+        def wanted(value: Any) -> bool:
+            return value is not None and not (isinstance(value, float) and isnan(value))
+
+        jobs: list[tuple[Optional[int], Data, tuple]] = []
+        if isinstance(expected, dict):
+            jobs.append((0, self.tests[0], (expected.get('test', None),)))
+            real: tuple[Optional[int], Data, tuple] = (None, self.data, (expected.get('real', None),))
+        elif isinstance(expected, list):
+            multifile: bool = len(self.tests) == len(expected)
+            testdata: list = self.tests if multifile else self.tests[0]
+            jobs.extend((i, test, ()) for i, (test, value) in enumerate(zip(testdata, expected)) if wanted(value))
+            real = (None, self.data if multifile else self.data[0], ())
+        else:
+            if wanted(expected):
+                jobs.append((0, self.tests[0], ()))
+            real = (None, self.data, ())
+
+        if not self.testonly:
+            jobs.append(real)
+        return jobs
+
+    @staticmethod
+    def count_setting(setting: Any, default: int) -> int:
+        """Convert a setting that is either a switch or a number (True, 'yes', 4, '4') into a number"""
+        if isinstance(setting, str):
+            setting = int(setting) if setting.isdigit() else setting.lower() in ('true', 'yes', 'on')
+        if setting is True:
+            return default
+        return int(setting or 0)
+
+    @contextmanager
+    def concurrently(self, checks: list[tuple[str, PuzzleResult]]) -> Iterator[None]:
+        """Start every part1 / part2 run in a pool of worker processes, for solve() to collect in order"""
+
+        if not self.concurrent:
+            yield
+            return
+
+        with ProcessPoolExecutor(self.workers) as executor:
+            self._futures = {
+                (name, index): executor.submit(execute, self, name, index, data, *args)
+                for name, expected in checks
+                for index, data, args in self.jobs(name, expected)
+            }
+            try:
+                yield
+            finally:
+                for future in self._futures.values():
+                    future.cancel()
+                self._futures = {}
+
     def check_data_files(self):
         filenames = [self.datafile]
         filenames.extend(self.testfiles)
@@ -214,83 +617,269 @@ class Puzzle:
     def single_test(self, name: str, expected, test_index: int = 0) -> None:
         """Execute one test run and one real run for part1 or part2"""
 
-        method = getattr(self, name)
-
         if expected is not None and not isnan(expected):
-            self.start()
-            self.currentfile = self.testfiles[test_index]
-            test_result = method(self.tests[test_index])
-            self.stop()
-            print(f'{self.elapsed_}: {name} test = {test_result}')
-            assert test_result == expected, f'Was {test_result}, should have been {expected}'
+            test_result = self.solve(name, test_index, self.tests[test_index])
+            self.report(f'{name} test = {test_result}')
+            assert isinstance(test_result, Status) or test_result == expected, f'Was {test_result}, should have been {expected}'
 
         if not self.testonly:
-            self.start()
-            self.currentfile = self.datafile
-            real_result = method(self.data)
-            self.stop()
-            print(f'{self.elapsed_}: {name} real = {real_result}')
+            real_result = self.solve(name, None, self.data)
+            self.report(f'{name} real = {real_result}')
 
     def multi_test(self, name: str, expectations: list, testdata: list, multifile: bool) -> None:
         """Execute multiple test runs and one real run for part1 or part2"""
 
-        method = getattr(self, name)
-
         for i, (test, expected) in enumerate(zip(testdata, expectations), 1):
             if expected is not None and not isnan(expected):
-                self.start()
-                self.currentfile = self.testfiles[i-1]
-                result = method(test)
-                self.stop()
-                passed = 'passed' if result == expected else 'failed'
-                print(
-                    f'{self.elapsed_}: {name} test {i}, {expected} == {result} => {passed}')
+                result = self.solve(name, i-1, test)
+                passed = 'passed' if result == expected else result if isinstance(result, Status) else 'failed'
+                self.report(f'{name} test {i}, {expected} == {result} => {passed}')
 
         if not self.testonly:
-            self.start()
-            self.currentfile = self.datafile
-            real_result: PuzzleResult = method(self.data) if multifile else method(self.data[0])
-            self.stop()
-            print(f'{self.elapsed_}: {name} real = {real_result}')
+            real_result: PuzzleResult = self.solve(name, None, self.data if multifile else self.data[0])
+            self.report(f'{name} real = {real_result}')
 
     def map_test(self, name: str, **keywords: dict) -> None:
         """Execute one test run and one real run for part1 or part2"""
 
-        method = getattr(self, name)
         expected: Optional[Any] = keywords.get('expected')
 
-        self.start()
-        self.currentfile = self.testfiles[0]
-        test_result = method(self.tests[0], keywords.get('test', None))
-        self.stop()
-        print(f'{self.elapsed_}: {name} test = {test_result}')
+        test_result = self.solve(name, 0, self.tests[0], keywords.get('test', None))
+        self.report(f'{name} test = {test_result}')
 
-        if not isnan(expected):  # type: ignore
+        if not isnan(expected) and not isinstance(test_result, Status):  # type: ignore
             assert test_result == expected, f'Was {test_result}, should have been {expected}'
 
         if not self.testonly:
+            real_result = self.solve(name, None, self.data, keywords.get('real', None))
+            self.report(f'{name} real = {real_result}')
+
+    def parse(self, type: str, filenames: list[str] | tuple[str, ...]) -> list[Data]:
+        """Parse a group of data files, timing them as a single phase"""
+
+        def action() -> list[Data]:
+            return [self.create_data(type, filename) for filename in filenames]
+
+        dataset: str = 'test' if type == 'test' else filenames[0]
+        return self.measure('parse', dataset, action)
+
+    def solve(self, name: str, test_index: Optional[int], data: Data, *args: Any) -> PuzzleResult:
+        """Run part1 or part2 against one test file (by index) or against the real data (None)"""
+
+        method: Callable = getattr(self, name)
+        self.currentfile = self.datafile if test_index is None else self.testfiles[test_index]
+
+        future: Optional[Future] = self._futures.pop((name, test_index), None)
+        if future:
+            return self.collect(name, *future.result())
+
+        if self.isolated:
+            return self.collect(name, *self.isolate(name, test_index, data, *args))
+
+        action: Callable = partial(self.profiled, name, method) if self.profile else method
+        with self.searching():
+            return self.measure(name, self.currentfile, action, data, *args, fresh=bool(self.repeat))
+
+    def collect(self, name: str, result: PuzzleResult, elapsed: float, memory: dict[str, int],
+                searches: Optional[search.SearchStats] = None) -> PuzzleResult:
+        """Record the result of a part run made in another process"""
+        self._elapsed, self._memory, self._searches = elapsed, memory, searches
+        self._overall += elapsed
+        self.timings.append(Timing(name, self.currentfile, elapsed, result, memory=memory))
+        return result
+
+    def isolate(self, name: str, test_index: Optional[int], data: Data,
+                *args: Any) -> tuple[PuzzleResult, float, dict, Optional[search.SearchStats]]:
+        """Run part1 or part2 in a child process, killing it if it runs out of time or memory"""
+
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=isolated, args=(sender, self, name, test_index, data, *args))
+
+        started: int = time.perf_counter_ns()
+        process.start()
+        sender.close()
+
+        try:
+            if not receiver.poll(self.time_budget or None):
+                return TIMEOUT, (time.perf_counter_ns() - started) / 1_000_000, {}, None
+            outcome: tuple = receiver.recv()
+        except EOFError:
+            process.join()
+            killed: bool = process.exitcode == -getattr(signal, 'SIGKILL', 9)
+            return OOM if killed and self.memory_budget else CRASHED, (time.perf_counter_ns() - started) / 1_000_000, {}, None
+        finally:
+            receiver.close()
+            terminate(process)
+
+        if outcome[0] == 'error':
+            raise outcome[1]
+        if outcome[0] == 'oom':
+            return OOM, outcome[1], {}, None
+        return outcome[1:]
+
+    @contextmanager
+    def searching(self) -> Iterator[None]:
+        """Instrument every search made within the block, combining the stats of the last run of the part"""
+
+        if not self.search_stats:
+            yield
+            return
+
+        instrument: bool = search.BaseSearch.instrument
+        search.BaseSearch.instrument = True
+        search.RECORDED = []
+        try:
+            yield
+        finally:
+            self._searches = search.SearchStats.total(search.RECORDED)
+            search.BaseSearch.instrument = instrument
+            search.RECORDED = None
+
+    def profiled(self, phase: str, action: Callable, *args: Any) -> Any:
+        """Run an action under cProfile (and optionally tracemalloc), saving reports next to the current data file"""
+
+        if not self.profile:
+            return action(*args)
+
+        profiler = cProfile.Profile()
+        tracing: bool = self.profile_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            return profiler.runcall(action, *args)
+        finally:
+            profiler.dump_stats(self.current_path(f'.{phase}.prof'))
+            if self.profile_memory:
+                tracemalloc.take_snapshot().dump(self.current_path(f'.{phase}.mem'))
+            if tracing:
+                tracemalloc.stop()
+            self._profiles[(phase, self.currentfile)] = self.hotspots(profiler)
+
+    def hotspots(self, profiler: cProfile.Profile) -> list[str]:
+        """Describe the functions with the largest cumulative times in a profile"""
+
+        stats: dict = pstats.Stats(profiler).stats  # type: ignore
+        ranked: list = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+
+        lines: list[str] = []
+        for (filename, line, function), (_, calls, _, cumulative, _) in ranked[:self.profile]:
+            where: str = f'{os.path.basename(filename)}:{line}({function})' if line else function
+            lines.append(f'             : {cumulative * 1000:10,.3f} ms {calls:10,d} calls  {where}')
+        return lines
+
+    def measure(self, phase: str, dataset: str, action: Callable, *args: Any, fresh: bool = False) -> Any:
+        """Time an action once, or (in benchmark mode) repeatedly after some warmup runs
+
+        If fresh is set, every run gets its own (untimed) copy of the arguments, so that actions which modify
+        their data always start from the same state; data with a snapshot() method (such as a Grid) is
+        snapshotted rather than deep copied, so that each run only pays for the cells it changes.
+        """
+
+        if not self.repeat:
+            self.start()
+            result: Any = self.call(action, *args)
+            self.stop(phase, dataset, result)
+            return result
+
+        samples: list[float] = []
+        for iteration in range(self.warmup + self.repeat):
+            arguments: tuple = tuple(map(fresh_copy, args)) if fresh else args
             self.start()
-            self.currentfile = self.datafile
-            real_result = method(self.data, keywords.get('real', None))
-            self.stop()
-            print(f'{self.elapsed_}: {name} real = {real_result}')
+            result = self.call(action, *arguments)
+            elapsed: float = self.lap()
+            if iteration >= self.warmup:
+                samples.append(elapsed)
+
+        self._elapsed = median(samples)
+        self._overall += self._elapsed
+        self.timings.append(Timing(phase, dataset, self._elapsed, result, samples, self._memory))
+        return result
+
+    def call(self, action: Callable, *args: Any) -> Any:
+        """Call an action, turning an interruption by the memory watchdog into a MemoryError"""
+
+        try:
+            return action(*args)
+        except BaseException as e:
+            if self.stop_watchdog() and isinstance(e, KeyboardInterrupt):
+                raise MemoryError(f'traced memory exceeded the {self.memory_limit:,d} MB limit') from None
+            raise
 
     # ----- Internal methods --------------------------------------------------
 
+    def report(self, message: str) -> None:
+        """Print a message along with the elapsed time of the last phase"""
+        print(f'{self.elapsed_}: {message}')
+        if self.repeat and self.timings:
+            stats: str = ' '.join(f'{k} {v:,.3f}' for k, v in self.timings[-1].statistics.items())
+            print(f'             : {stats} ms ({self.repeat} runs, {self.warmup} warmup)')
+        if self._searches:
+            print(f'             : {self._searches}')
+            self._searches = None
+        for (phase, filename), lines in self._profiles.items():
+            print(f'             : {phase} {filename} profile (top {len(lines)} by cumulative time)')
+            print('\n'.join(lines))
+        self._profiles.clear()
+
     def start(self) -> None:
-        """Start a timer"""
+        """Start a timer (and start tracking memory, in memory mode)"""
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._baseline = (tracemalloc.get_traced_memory()[0], sys.getallocatedblocks(), max_rss())
+            if self.memory_limit:
+                self._watchdog = MemoryWatchdog(self._baseline[0] + self.memory_limit * 1024 * 1024)
+                self._watchdog.start()
+        if search.RECORDED:
+            search.RECORDED.clear()
         self._started: int = time.perf_counter_ns()
 
-    def stop(self) -> None:
+    def lap(self) -> float:
+        """Return the elapsed time in milliseconds since the timer started, without recording it"""
+        elapsed: float = (time.perf_counter_ns() - self._started) / 1_000_000
+        if self.memory:
+            self.stop_watchdog()
+            traced, blocks, rss = self._baseline
+            self._memory = {
+                'peak': tracemalloc.get_traced_memory()[1] - traced,
+                'blocks': sys.getallocatedblocks() - blocks,
+                'rss': max_rss() - rss,
+            }
+        return elapsed
+
+    def stop(self, phase: str = '', dataset: str = '', result: Any = None) -> None:
         """Stop the timer and save the elapsed time in milliseconds"""
-        self._elapsed: float = (time.perf_counter_ns() - self._started) / 1_000_000
+        self._elapsed: float = self.lap()
         self._overall += self._elapsed
+        if phase:
+            self.timings.append(Timing(phase, dataset, self._elapsed, result, memory=self._memory))
+
+    def stop_watchdog(self) -> bool:
+        """Stop the memory watchdog, returning True if it interrupted the current phase"""
+        watchdog: Optional[MemoryWatchdog] = self._watchdog
+        self._watchdog = None
+        return watchdog.stop() if watchdog else False
+
+    def elapsed(self, phase: str) -> float:
+        """Total elapsed time in milliseconds for one phase of the last run"""
+        return sum(t.elapsed for t in self.timings if t.phase == phase)
+
+    @property
+    def overall(self) -> float:
+        return self._overall
 
     @property
     def elapsed_(self) -> str:
-        """Format the elapsed time in milliseconds"""
+        """Format the elapsed time in milliseconds (and the memory used, in memory mode)"""
+        if self.memory and self._memory:
+            return f'{self._elapsed:10,.3f} ms {self.memory_}'
         return f'{self._elapsed:10,.3f} ms'
 
+    @property
+    def memory_(self) -> str:
+        """Format the peak traced memory, net allocated blocks and peak RSS growth"""
+        memory: dict[str, int] = self._memory
+        return f'{memory["peak"] / 1024:12,.1f} KiB peak {memory["blocks"]:+11,d} blocks {memory["rss"] / 1024:+10,.0f} KiB rss'
+
     @property
     def overall_(self) -> str:
         """Format the overall time in milliseconds"""
@@ -302,4 +891,62 @@ class Puzzle:
         return f'{instant:10,.3f} ms'
 
 
-__all__: list[str] = ["Data", "Puzzle", "PuzzleResult", "IGNORE"]
+def execute(puzzle: Puzzle, name: str, test_index: Optional[int], data: Data,
+            *args: Any) -> tuple[PuzzleResult, float, dict, Optional[search.SearchStats]]:
+    """Run part1 or part2 in a worker process, returning the result, elapsed time in milliseconds, memory used
+    and search stats"""
+
+    if puzzle.memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+    puzzle.currentfile = puzzle.datafile if test_index is None else puzzle.testfiles[test_index]
+    puzzle.start()
+    with puzzle.searching():
+        result: PuzzleResult = puzzle.call(getattr(puzzle, name), data, *args)
+        elapsed: float = puzzle.lap()
+    return result, elapsed, puzzle._memory, puzzle._searches
+
+
+def isolated(connection: Any, puzzle: Puzzle, name: str, test_index: Optional[int], data: Data, *args: Any) -> None:
+    """Run part1 or part2 in a child process within its memory budget, sending the outcome to the parent"""
+
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()  # so that the parent can kill any processes this part starts
+
+    if puzzle.memory_budget and resource:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit: int = address_space() + puzzle.memory_budget * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit if hard == resource.RLIM_INFINITY else min(limit, hard), hard))
+
+    started: int = time.perf_counter_ns()
+    try:
+        connection.send(('result', *execute(puzzle, name, test_index, data, *args)))
+    except MemoryError:
+        connection.send(('oom', (time.perf_counter_ns() - started) / 1_000_000))
+    except Exception as e:
+        connection.send(('error', e))
+    finally:
+        connection.close()
+
+
+def terminate(process: multiprocessing.Process) -> None:
+    """Kill a child process (and its process group) if it's still running"""
+
+    if process.is_alive():
+        try:
+            os.killpg(process.pid, signal.SIGKILL)  # type: ignore
+        except (AttributeError, OSError):
+            process.kill()
+    process.join()
+
+
+def address_space() -> int:
+    """The virtual memory size of this process, in bytes"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return max_rss()
+
+
+__all__: list[str] = ["Data", "Puzzle", "PuzzleResult", "IGNORE", "PUZZLES", "Status", "Stream", "Timing", "TIMEOUT", "OOM", "CRASHED"]
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import time
+
 from collections import defaultdict
 from dataclasses import dataclass, field
 from heapq import heapify, heappop, heappush, heappushpop, heapreplace  # noqa: F401
+from itertools import count
 from operator import gt, lt, add, sub
-from typing import Any, Callable, Optional
+from typing import Any, Callable, Container, Hashable, Iterable, Iterator, Optional
+
+REMOVED: Any = object()
+
+# The runner sets this to a list, to collect the stats of every search made while a part runs
+RECORDED: Optional[list[SearchStats]] = None
 
 
 @dataclass(order=True, unsafe_hash=True)
@@ -23,17 +31,123 @@ class SearchNode:
         return self.node == other.node
 
 
+@dataclass
+class SearchStats:
+    """How hard a search worked; the node counts are only kept while the search's `instrument` is set"""
+
+    expanded: int = 0
+    generated: int = 0
+    peak_frontier: int = 0
+    relaxations: int = 0
+    heuristic_calls: int = 0
+    elapsed: float = 0.0  # milliseconds
+    path_length: int = 0
+    searches: int = 1
+
+    def __iadd__(self, other: SearchStats) -> SearchStats:
+        self.expanded += other.expanded
+        self.generated += other.generated
+        self.peak_frontier = max(self.peak_frontier, other.peak_frontier)
+        self.relaxations += other.relaxations
+        self.heuristic_calls += other.heuristic_calls
+        self.elapsed += other.elapsed
+        self.path_length += other.path_length
+        self.searches += other.searches
+        return self
+
+    @classmethod
+    def total(cls, stats: Iterable[SearchStats]) -> Optional[SearchStats]:
+        """Combine the stats of several searches, with the largest peak frontier and the sum of everything else"""
+        combined: Optional[SearchStats] = None
+        for item in stats:
+            if combined is None:
+                combined = cls()
+                combined.searches = 0
+            combined += item
+        return combined
+
+    def __str__(self) -> str:
+        return (f'{self.searches:,d} searches, {self.expanded:,d} expanded, {self.generated:,d} generated, '
+                f'{self.peak_frontier:,d} peak frontier, {self.relaxations:,d} relaxations, '
+                f'{self.heuristic_calls:,d} heuristic calls, path length {self.path_length:,d}, {self.elapsed:,.3f} ms')
+
+
+class PriorityQueue:
+    """A min-heap of items with changeable priorities (decrease-key), using lazy deletion
+
+    Pushing an item that is already queued replaces its priority: the old heap entry is
+    marked as removed and skipped when it reaches the top, so every operation is O(log n).
+    Items must be hashable; ties are broken by the order items were pushed.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[list[Any]] = []
+        self._entries: dict[Any, list[Any]] = {}
+        self._counter: Iterator[int] = count()
+
+    def push(self, item: Any, priority: float) -> None:
+        """Add an item, or change the priority of an item that is already queued"""
+        entry: Optional[list[Any]] = self._entries.pop(item, None)
+        if entry is not None:
+            entry[-1] = REMOVED
+        entry = [priority, next(self._counter), item]
+        self._entries[item] = entry
+        heappush(self._heap, entry)
+
+    def pop(self) -> Any:
+        """Remove and return the item with the lowest priority"""
+        heap: list[list[Any]] = self._heap
+        while heap:
+            item: Any = heappop(heap)[-1]
+            if item is not REMOVED:
+                del self._entries[item]
+                return item
+        raise KeyError('pop from an empty priority queue')
+
+    def remove(self, item: Any) -> None:
+        """Remove a queued item"""
+        self._entries.pop(item)[-1] = REMOVED
+
+    def priority(self, item: Any) -> float:
+        """The priority of a queued item"""
+        return self._entries[item][0]
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __bool__(self) -> bool:
+        return bool(self._entries)
+
+
 class BaseSearch:
     """Base class that provides common operations
     for using SearchNodes that are wrappers around a generic node
+
+    After each search, `stats` describes how hard it worked. Set `instrument`
+    (on a search, or on a search class) to count nodes as well as time the search.
     """
 
+    instrument: bool = False
+
     @property
     def unseen(self) -> int:
         return 999_999_999
 
     def _clear(self) -> None:
         self._search_node_map: dict[Any, SearchNode] = {}
+        self.stats: SearchStats = SearchStats()
+        self._started: int = time.perf_counter_ns()
+
+    def _finish(self, path: Optional[list[Any]]) -> Optional[list[Any]]:
+        """Complete the stats of a search (and record them, for the runner), returning the path it found"""
+        self.stats.elapsed = (time.perf_counter_ns() - self._started) / 1_000_000
+        self.stats.path_length = len(path) - 1 if path else 0
+        if RECORDED is not None and self.instrument:
+            RECORDED.append(self.stats)
+        return path
 
     def _find(self, node: Any) -> SearchNode:
         if node not in self._search_node_map:
@@ -62,50 +176,225 @@ class BaseSearch:
         """Return a list of all of the neighbors of a node"""
         raise NotImplementedError('neighbors function')
 
+    def distance(self, src: Any, dst: Any) -> float:
+        """Distance between two neighboring nodes"""
+        raise NotImplementedError('distance function')
+
     def search(self, origin: Any, *target: Any) -> Optional[list[Any]]:
         """Return a list representing the path from the origin to a target"""
         raise NotImplementedError('search function')
 
 
-# class UniformCostSearch(BaseSearch):
-#     """Implement the uniform-cost search algorithm
+class UniformCostSearch(BaseSearch):
+    """Implement the uniform-cost search (Dijkstra's) algorithm for Any type of hashable node
+
+    Nodes are not wrapped in SearchNodes: the frontier is a heap of plain (cost, counter, node)
+    tuples, and entries made stale by a cheaper path are skipped when they're popped.
+
+    Use this as a mixin and implement the `neighbors` and `distance` methods.
+    Call `search` to get the cheapest list of nodes traversed from an origin to any target,
+    `nearest` to search from several origins at once, or `distances` to get the cost of
+    reaching every node. Distances must not be negative.
+
+    Notes: https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm#Using_a_priority_queue
+    """
+
+    def _clear(self) -> None:
+        super()._clear()
+        self._cost: dict[Any, float] = {}
+        self._previous: dict[Any, Any] = {}
+
+    def _expand(self, origins: Iterable[Any], targets: Container[Any]) -> Optional[Any]:
+        """Expand nodes in order of cost until a target is reached (and return it) or the frontier is empty"""
+
+        self._clear()
+        cost: dict[Any, float] = self._cost
+        previous: dict[Any, Any] = self._previous
+        counter: Iterator[int] = count()
+        stats: Optional[SearchStats] = self.stats if self.instrument else None
+
+        frontier: list[tuple[float, int, Any]] = []
+        for origin in origins:
+            cost[origin] = 0
+            previous[origin] = None
+            frontier.append((0, next(counter), origin))
+
+        while frontier:
+            current_cost, _, current = heappop(frontier)
+            if current_cost > cost[current]:
+                continue
+            if current in targets:
+                return current
+            if stats:
+                stats.expanded += 1
+
+            for node in self.neighbors(current):
+                tentative: float = current_cost + self.distance(current, node)
+                if stats:
+                    stats.generated += 1
+                if node not in cost or tentative < cost[node]:
+                    if stats:
+                        stats.relaxations += node in cost
+                        stats.peak_frontier = max(stats.peak_frontier, len(frontier) + 1)
+                    cost[node] = tentative
+                    previous[node] = current
+                    heappush(frontier, (tentative, next(counter), node))
+
+        return None
+
+    def _path(self, node: Any) -> list[Any]:
+        path: list[Any] = [node]
+
+        while self._previous[node] is not None:
+            node = self._previous[node]
+            path.append(node)
+
+        path.reverse()
+
+        return path
+
+    def previous(self, node: Any) -> Any:
+        return self._previous.get(node)
+
+    def cost(self, node: Any) -> float:
+        """The cost of the cheapest path found to a node, after a search"""
+        return self._cost[node]
+
+    def nearest(self, origins: Iterable[Any], targets: Iterable[Any]) -> Optional[list[Any]]:
+        """Return the cheapest path from any of the origins to any of the targets"""
+        reached: Optional[Any] = self._expand(origins, set(targets))
+        return self._finish(None if reached is None else self._path(reached))
 
-#     Each node in the search graph / grid gets wrapped in a SearchNode
-#     as it becomes visible in the search.
+    def search(self, origin: Any, *target: Any) -> Optional[list[Any]]:
+        return self.nearest([origin], target)
+
+    def distances(self, *origins: Any) -> dict[Any, float]:
+        """Return the cost of the cheapest path from the nearest origin to every reachable node"""
+        self._expand(origins, ())
+        self._finish(None)
+        return self._cost
 
-#     Use this as a mixin and implement the `neighbors` method(s).
-#     Call `search` to get the optimum list of nodes traversed.
 
-#     Notes: https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm#Practical_optimizations_and_infinite_graphs
-#     """
+class BreadthFirstSearch(BaseSearch):
+    """Implement breadth-first search of an unweighted graph or state space, for Any type of node
 
-#     def search(self, origin: Any, *target: Any) -> Optional[list[Any]]:
-#         self._clear()
+    Each state is queued at most once: `encode` packs states into hashable keys (the node itself,
+    by default; override it to pack large states into ints or tuples), and states whose keys
+    have been seen are dropped.
 
-#         s_origin: SearchNode = self._find(origin)
-#         s_target: list[SearchNode] = list(map(self._find, target))
+    Use this as a mixin and implement the `neighbors` method (and `predecessors`, for a directed
+    graph searched bidirectionally). Call `search` to get the shortest list of nodes traversed.
+    Set `bidirectional` to search from both the origin and a single target, meeting in the middle.
 
-#         frontier: list[SearchNode] = []
-#         expanded: list[SearchNode] = []
+    As the search goes, `layers` (and `reverse_layers`, from the target) collect the number of
+    states in each depth layer, and `layer` is called with each one.
 
-#         heappush(frontier, s_origin)
+    Notes: https://en.wikipedia.org/wiki/Breadth-first_search
+           https://en.wikipedia.org/wiki/Bidirectional_search
+    """
 
-#         while len(frontier):
-#             current: SearchNode = heappop(frontier)
-#             if current in s_target:
-#                 return self._solution(current)
+    bidirectional: bool = False
 
-#             expanded.append(current)
+    def encode(self, node: Any) -> Hashable:
+        """Pack a node into a hashable key that identifies its state"""
+        return node
 
-#             for node in self.neighbors(current.node):
-#                 neighbor: SearchNode = self._find(node)
-#                 if neighbor not in expanded and neighbor not in frontier:
-#                     neighbor.previous = current
-#                     heappush(frontier, neighbor)
-#                 else:
-#                     try:
-#                         i: int = frontier.index(neighbor)
-#                         if frontier[i].cost
+    def predecessors(self, node: Any) -> list[Any]:
+        """Return a list of the nodes that have a node as a neighbor (the neighbors, if edges are undirected)"""
+        return self.neighbors(node)
+
+    def layer(self, depth: int, size: int) -> None:
+        """Called with the size of each depth layer as it is completed (with negative depths from the target)"""
+
+    def _clear(self) -> None:
+        super()._clear()
+        self.layers: list[int] = []
+        self.reverse_layers: list[int] = []
+
+    def _report(self, layers: list[int], size: int, sign: int = 1) -> None:
+        self.layer(sign * len(layers), size)
+        layers.append(size)
+        if self.instrument:
+            self.stats.peak_frontier = max(self.stats.peak_frontier, size)
+
+    def _trace(self, visited: dict[Hashable, tuple[Any, Optional[Hashable]]], key: Optional[Hashable]) -> list[Any]:
+        path: list[Any] = []
+
+        while key is not None:
+            node, key = visited[key]
+            path.append(node)
+
+        path.reverse()
+
+        return path
+
+    def _advance(
+            self, layer: list[tuple[Any, Hashable]], visited: dict[Hashable, tuple[Any, Optional[Hashable]]],
+            expand: Callable[[Any], list[Any]], goals: Container[Hashable]) -> tuple[list[tuple[Any, Hashable]], Optional[Hashable]]:
+        """Expand a layer into the next one, stopping early (and returning its key) if a goal is reached"""
+
+        encode: Callable[[Any], Hashable] = self.encode
+        stats: Optional[SearchStats] = self.stats if self.instrument else None
+        following: list[tuple[Any, Hashable]] = []
+        for node, key in layer:
+            if stats:
+                stats.expanded += 1
+            for child in expand(node):
+                if stats:
+                    stats.generated += 1
+                child_key: Hashable = encode(child)
+                if child_key not in visited:
+                    visited[child_key] = (child, key)
+                    if child_key in goals:
+                        return following, child_key
+                    following.append((child, child_key))
+        return following, None
+
+    def search(self, origin: Any, *target: Any) -> Optional[list[Any]]:
+        self._clear()
+
+        if self.bidirectional and len(target) == 1:
+            return self._meet(origin, target[0])
+
+        key: Hashable = self.encode(origin)
+        goals: set[Hashable] = set(map(self.encode, target))
+        visited: dict[Hashable, tuple[Any, Optional[Hashable]]] = {key: (origin, None)}
+        if key in goals:
+            return self._finish([origin])
+
+        layer: list[tuple[Any, Hashable]] = [(origin, key)]
+        while layer:
+            self._report(self.layers, len(layer))
+            layer, reached = self._advance(layer, visited, self.neighbors, goals)
+            if reached is not None:
+                return self._finish(self._trace(visited, reached))
+
+        return self._finish(None)
+
+    def _meet(self, origin: Any, target: Any) -> Optional[list[Any]]:
+        """Search from both ends, a whole layer at a time from the smaller side, until a state is reached from both"""
+
+        origin_key: Hashable = self.encode(origin)
+        target_key: Hashable = self.encode(target)
+        if origin_key == target_key:
+            return self._finish([origin])
+
+        forward: dict[Hashable, tuple[Any, Optional[Hashable]]] = {origin_key: (origin, None)}
+        backward: dict[Hashable, tuple[Any, Optional[Hashable]]] = {target_key: (target, None)}
+        forward_layer: list[tuple[Any, Hashable]] = [(origin, origin_key)]
+        backward_layer: list[tuple[Any, Hashable]] = [(target, target_key)]
+
+        while forward_layer and backward_layer:
+            if len(forward_layer) <= len(backward_layer):
+                self._report(self.layers, len(forward_layer))
+                forward_layer, met = self._advance(forward_layer, forward, self.neighbors, backward)
+            else:
+                self._report(self.reverse_layers, len(backward_layer), -1)
+                backward_layer, met = self._advance(backward_layer, backward, self.predecessors, forward)
+            if met is not None:
+                return self._finish(self._trace(forward, met) + self._trace(backward, met)[-2::-1])
+
+        return self._finish(None)
 
 
 class AstarSearch(BaseSearch):
@@ -120,10 +409,6 @@ class AstarSearch(BaseSearch):
     Notes: https://en.wikipedia.org/wiki/A*_search_algorithm
     """
 
-    def distance(self, src: Any, dst: Any) -> float:
-        """Distance between two neighboring nodes"""
-        raise NotImplementedError('distance function')
-
     def heuristic(self, node: Any) -> float:
         """Estimate the cost to get to the goal from a node"""
         raise NotImplementedError('heuristic function')
@@ -141,30 +426,40 @@ class AstarSearch(BaseSearch):
         self._clear()
 
         s_origin: SearchNode = self._find(origin)
-        s_target: list[SearchNode] = list(map(self._find, target))
+        s_target: set[SearchNode] = set(map(self._find, target))
 
-        frontier: list[SearchNode] = []
-        heappush(frontier, s_origin)
+        frontier: PriorityQueue = PriorityQueue()
+        frontier.push(s_origin, s_origin.cost)
 
         cheapest: dict[SearchNode, float] = defaultdict(lambda: self.unseen)
         cheapest[s_origin] = 0
 
-        while len(frontier):
-            current: SearchNode = heappop(frontier)
+        stats: Optional[SearchStats] = self.stats if self.instrument else None
+
+        while frontier:
+            current: SearchNode = frontier.pop()
             if current in s_target:
-                return self._solution(current)
+                return self._finish(self._solution(current))
+            if stats:
+                stats.expanded += 1
 
             for node in self.neighbors(current.node):
                 neighbor: SearchNode = self._find(node)
                 tentative: float = self.addition(cheapest[current], self.distance(current.node, neighbor.node))
+                if stats:
+                    stats.generated += 1
                 if self.comparison(tentative, cheapest[neighbor]):
+                    if stats:
+                        stats.relaxations += cheapest[neighbor] != self.unseen
+                        stats.heuristic_calls += 1
                     cheapest[neighbor] = tentative
                     neighbor.previous = current
                     neighbor.cost = self.addition(tentative, self.heuristic(neighbor.node))
-                    if neighbor not in frontier:
-                        heappush(frontier, neighbor)
+                    frontier.push(neighbor, neighbor.cost)
+                    if stats:
+                        stats.peak_frontier = max(stats.peak_frontier, len(frontier))
 
-        return None
+        return self._finish(None)
 
 
 class LongestSearch(AstarSearch):
@@ -182,4 +477,4 @@ class LongestSearch(AstarSearch):
         return sub
 
 
-__all__: list[str] = ["SearchNode", "AstarSearch", "LongestSearch"]
+__all__: list[str] = ["PriorityQueue", "SearchNode", "SearchStats", "UniformCostSearch", "BreadthFirstSearch", "AstarSearch", "LongestSearch"]
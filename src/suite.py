@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import glob
+import os
+import sys
+import time
+import traceback
+
+from argparse import ArgumentParser, Namespace
+from importlib import import_module
+
+from runner import PUZZLES, Puzzle
+
+TOP: str = os.path.dirname(os.path.abspath(__file__))
+PHASES: list[str] = ['parse', 'part1', 'part2']
+
+# Options that take a value, and the runner setting each one gives that value to (switching it on)
+SETTINGS: dict[str, str] = {'history_file': 'history', 'workers': 'concurrent', 'profile_top': 'profile'}
+
+
+def day_name(argument: str) -> str:
+    """Normalize a day argument (1, 01, day01, day01/puzzle01.py) into a directory name"""
+    digits: str = ''.join(ch for ch in os.path.basename(os.path.dirname(argument) or argument) if ch.isdigit())
+    return f'day{int(digits):02d}' if digits else argument
+
+
+def discover(days: list[str]) -> list[Puzzle]:
+    """Import the requested puzzle modules, returning their registered puzzles in day order"""
+
+    for path in sorted(glob.glob(os.path.join(TOP, 'day[0-9][0-9]', 'puzzle[0-9][0-9].py'))):
+        day: str = os.path.basename(os.path.dirname(path))
+        if days and day not in days:
+            continue
+        module: str = os.path.splitext(os.path.basename(path))[0]
+        import_module(f'{day}.{module}')
+
+    missing: list[str] = [day for day in days if day not in PUZZLES]
+    if missing:
+        print(f'No puzzle found for {", ".join(missing)}')
+
+    return [PUZZLES[day] for day in sorted(PUZZLES) if day.startswith('day') and (not days or day in days)]
+
+
+def summarize(puzzles: list[Puzzle], wall: float) -> None:
+    """Print a combined timing table for every puzzle that was run"""
+
+    print('===== Summary =====')
+    print(f'{"day":6s}' + ''.join(f'{phase:>16s}' for phase in PHASES + ['total']))
+
+    totals: dict[str, float] = {phase: 0.0 for phase in PHASES}
+    for puzzle in puzzles:
+        elapsed: dict[str, float] = {phase: puzzle.elapsed(phase) for phase in PHASES}
+        for phase in PHASES:
+            totals[phase] += elapsed[phase]
+        columns: list[float] = [elapsed[phase] for phase in PHASES] + [puzzle.overall]
+        print(f'{puzzle.day:6s}' + ''.join(f'{column:13,.3f} ms' for column in columns))
+
+    columns = [totals[phase] for phase in PHASES] + [sum(totals.values())]
+    print(f'{"total":6s}' + ''.join(f'{column:13,.3f} ms' for column in columns))
+    print(f'{"wall":6s}{wall:13,.3f} ms')
+
+
+def options(arguments: list[str]) -> Namespace:
+    parser = ArgumentParser(description='Run Advent of Code puzzles in a single process')
+    parser.add_argument('days', nargs='*', help='days to run (1, 01, day01); defaults to every day')
+    parser.add_argument('--data', dest='datafile', metavar='FILE',
+                        help='use FILE in each day directory (such as scale4.data from generate.py) as the real data')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='run each part N times and report statistics')
+    parser.add_argument('--warmup', type=int, metavar='K', help='untimed runs before benchmarking each part')
+    parser.add_argument('--concurrent', action='store_true', default=None,
+                        help='run the parts of each day in a pool of worker processes, one per CPU')
+    parser.add_argument('--workers', type=int, metavar='N', help='use a pool of N worker processes (implies --concurrent)')
+    parser.add_argument('--profile', action='store_true', default=None,
+                        help='profile parsing and each part, listing the top functions by cumulative time')
+    parser.add_argument('--profile-top', type=int, metavar='N', help='list the top N functions (implies --profile)')
+    parser.add_argument('--profile-memory', action='store_true', default=None,
+                        help='also record tracemalloc snapshots while profiling')
+    parser.add_argument('--memory', action='store_true', default=None,
+                        help='report peak traced memory, allocated blocks and RSS growth for each phase')
+    parser.add_argument('--memory-limit', type=int, metavar='MB',
+                        help='abort any phase whose traced memory grows by more than MB megabytes')
+    parser.add_argument('--search-stats', action='store_true', default=None,
+                        help='report the nodes expanded, frontier size and other counts of every search in each part')
+    parser.add_argument('--time-budget', type=float, metavar='SECONDS',
+                        help='run each part in a child process, stopping it after SECONDS')
+    parser.add_argument('--memory-budget', type=int, metavar='MB',
+                        help='run each part in a child process, limiting its memory to MB megabytes')
+    parser.add_argument('--history', action='store_true', default=None,
+                        help='append the timings to the history file (history.jsonl)')
+    parser.add_argument('--history-file', metavar='FILE', help='append the timings to FILE instead (implies --history)')
+    parser.add_argument('--cache', action='store_true', default=None, help='reuse parsed data from earlier runs')
+    parser.add_argument('--cache-limit', type=int, metavar='MB', help='cache size limit for each day, in megabytes')
+    return parser.parse_args(arguments)
+
+
+def main(arguments: list[str]) -> None:
+    started: int = time.perf_counter_ns()
+
+    args: Namespace = options(arguments)
+    keywords: dict = {k: v for k, v in vars(args).items() if k != 'days' and v is not None}
+    for option, setting in SETTINGS.items():
+        if option in keywords:
+            keywords[setting] = keywords.pop(option)
+
+    days: list[str] = [day_name(day) for day in args.days]
+    puzzles: list[Puzzle] = discover(days)
+
+    for puzzle in puzzles:
+        try:
+            puzzle.run(**keywords)
+        except Exception:
+            traceback.print_exc()
+
+    summarize(puzzles, (time.perf_counter_ns() - started) / 1_000_000)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
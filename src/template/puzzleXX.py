@@ -16,5 +16,7 @@ class DayXX(Puzzle):
         return 0
 
 
-puzzle = DayXX()
-puzzle.run()
+puzzle = DayXX().register()
+
+if __name__ == '__main__':
+    puzzle.run()
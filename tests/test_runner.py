@@ -0,0 +1,44 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import runner
+from runner import Puzzle
+
+
+class SplitReaderTest(unittest.TestCase):
+    """iter_split streams the same records as read_split, whatever the chunk size"""
+
+    SAMPLES: list[str] = [
+        '', '\n', 'a', 'a\n', 'a,b', 'a,b,', 'a,b,\n', 'a,b,,\n\n', ',a,b', '  a , b ,\n', 'a,\n,b\n',
+        'a\n\nb\n\n', 'a\n\nb\n\n\n', '\n\na\n\n\n\nb\n\n', 'a\n\n', 'a\n\n \n',
+    ]
+
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.puzzle = Puzzle('sample.data')
+        self.puzzle.base = self.directory.name
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def check(self, text: str, sep: str) -> None:
+        with open(os.path.join(self.directory.name, 'sample.data'), 'w') as df:
+            df.write(text)
+        expected = self.puzzle.read_split('sample.data', sep)
+        for chunk in (1, 2, 3, 1024):
+            with self.subTest(text=text, sep=sep, chunk=chunk), mock.patch.object(runner, 'STREAM_CHUNK', chunk):
+                self.assertEqual(list(self.puzzle.iter_split('sample.data', sep)), expected)
+
+    def test_trailing_separator(self) -> None:
+        for text in self.SAMPLES:
+            self.check(text, ',')
+
+    def test_blank_line_separator(self) -> None:
+        for text in self.SAMPLES:
+            self.check(text, '\n\n')
+
+
+if __name__ == '__main__':
+    unittest.main()